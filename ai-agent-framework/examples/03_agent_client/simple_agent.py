@@ -12,6 +12,7 @@ Key Learning Concepts:
 - Context management across tool calls
 """
 
+import json
 import sys
 from pathlib import Path
 
@@ -259,31 +260,11 @@ class SimpleTaskAgent(BaseAgent):
         
         directory_content = list_result.content[0].text
         
-        # Parse the directory listing to get individual files
-        lines = directory_content.split('\n')[1:]  # Skip header
-        files = []
-        directories = []
-        total_size = 0
-        
-        for line in lines:
-            if line.strip():
-                if line.startswith("file:"):
-                    file_name = line.split(": ", 1)[1]
-                    # Extract size if present
-                    if "(" in file_name and " bytes)" in file_name:
-                        name_part = file_name.split(" (")[0]
-                        size_part = file_name.split("(")[1].split(" bytes)")[0]
-                        try:
-                            size = int(size_part)
-                            total_size += size
-                        except ValueError:
-                            pass
-                        files.append(name_part)
-                    else:
-                        files.append(file_name)
-                elif line.startswith("directory:"):
-                    dir_name = line.split(": ", 1)[1]
-                    directories.append(dir_name)
+        # The listing is JSON after a one-line header
+        listing = json.loads(directory_content.partition('\n\n')[2])
+        files = [entry["name"] for entry in listing["files"]]
+        directories = listing["directories"]
+        total_size = sum(entry["size"] or 0 for entry in listing["files"])
         
         analysis = {
             "path": dir_path,
@@ -374,13 +355,9 @@ class SimpleTaskAgent(BaseAgent):
         list_result = await self.call_tool("list_directory", {"path": directory})
         directory_content = list_result.content[0].text
         
-        # Extract file names (simple parsing)
-        lines = directory_content.split('\n')[1:]  # Skip header
-        files = []
-        for line in lines:
-            if line.strip() and line.startswith("file:"):
-                file_name = line.split(": ", 1)[1].split(" (")[0]  # Remove size info
-                files.append(file_name)
+        # Extract file names from the JSON listing
+        listing = json.loads(directory_content.partition('\n\n')[2])
+        files = [entry["name"] for entry in listing["files"]]
         
         results = []
         
@@ -12,11 +12,12 @@ It demonstrates core MCP client patterns:
 """
 
 import asyncio
-import json
 import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
 
+import anyio
+import orjson
 from mcp.client.stdio import stdio_client
 from mcp.types import CallToolResult, TextContent
 
@@ -25,6 +26,14 @@ from ..core.types import (
     AgentRegistration, AgentStatus, MCPServerConfig
 )
 
+# Errors meaning a session's transport is gone, not that one call failed
+_TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
 
 class BaseAgent(ABC):
     """
@@ -44,6 +53,7 @@ class BaseAgent(ABC):
         """
         self.name = name
         self.registration = registration
+        self._supported_types = frozenset(registration.supported_task_types)
         self.status = AgentStatus.OFFLINE
         self.current_tasks: List[str] = []
         self.logger = self._setup_logging()
@@ -53,6 +63,14 @@ class BaseAgent(ABC):
         self._available_tools: Dict[str, Dict[str, Any]] = {}
         self._available_resources: Dict[str, Dict[str, Any]] = {}
         
+        # Persistent MCP sessions, one per server. Each session is opened and
+        # closed by its own owner task, since the transport's cancel scopes
+        # must be exited by the task that entered them.
+        self._mcp_clients: Dict[str, Any] = {}
+        self._mcp_owners: Dict[str, asyncio.Task] = {}
+        self._mcp_closing: Dict[str, asyncio.Event] = {}
+        self._mcp_locks: Dict[str, asyncio.Lock] = {}
+        
         # Agent state
         self._context: Optional[Context] = None
         self._error_count = 0
@@ -122,51 +140,134 @@ class BaseAgent(ABC):
             raise ValueError(f"Server {server_name} not connected")
             
         server_info = self._connected_servers[server_name]
-        server_params = server_info["params"]
         
         try:
-            # Use temporary connection for discovery
-            async with stdio_client(server_params) as (read, write, client):
-                await client.initialize()
-                
-                # Discover tools
-                tools_result = await client.list_tools()
-                for tool in tools_result.tools:
-                    tool_info = {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "inputSchema": tool.inputSchema,
+            # Discovery opens the session that later tool calls reuse
+            client = await self._get_client(server_name)
+            
+            # Discover tools
+            tools_result = await client.list_tools()
+            for tool in tools_result.tools:
+                tool_info = {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "inputSchema": tool.inputSchema,
+                    "server": server_name
+                }
+                self._available_tools[tool.name] = tool_info
+                server_info["tools"][tool.name] = tool_info
+            
+            # Discover resources
+            try:
+                resources_result = await client.list_resources()
+                for resource in resources_result.resources:
+                    resource_info = {
+                        "uri": resource.uri,
+                        "name": resource.name,
+                        "description": resource.description,
+                        "mimeType": resource.mimeType,
                         "server": server_name
                     }
-                    self._available_tools[tool.name] = tool_info
-                    server_info["tools"][tool.name] = tool_info
-                
-                # Discover resources
-                try:
-                    resources_result = await client.list_resources()
-                    for resource in resources_result.resources:
-                        resource_info = {
-                            "uri": resource.uri,
-                            "name": resource.name,
-                            "description": resource.description,
-                            "mimeType": resource.mimeType,
-                            "server": server_name
-                        }
-                        self._available_resources[resource.uri] = resource_info
-                        server_info["resources"][resource.uri] = resource_info
-                except Exception as e:
-                    # Resources are optional, don't fail if not supported
-                    self.logger.debug(f"Resource discovery failed for {server_name}: {e}")
-                
-                self.logger.info(
-                    f"Discovered {len(server_info['tools'])} tools and "
-                    f"{len(server_info['resources'])} resources from {server_name}"
-                )
-                
+                    self._available_resources[resource.uri] = resource_info
+                    server_info["resources"][resource.uri] = resource_info
+            except Exception as e:
+                # Resources are optional, don't fail if not supported
+                self.logger.debug(f"Resource discovery failed for {server_name}: {e}")
+            
+            self.logger.info(
+                f"Discovered {len(server_info['tools'])} tools and "
+                f"{len(server_info['resources'])} resources from {server_name}"
+            )
+            
         except Exception as e:
             self.logger.error(f"Capability discovery failed for {server_name}: {e}")
+            await self._disconnect_server(server_name)
             raise
     
+    async def _get_client(self, server_name: str) -> Any:
+        """
+        Return the persistent MCP session for a server, opening it if needed.
+        
+        The stdio subprocess and initialize handshake are paid once per server
+        rather than once per tool call. The session's single reader task
+        matches responses to pending requests by id, so concurrent calls share
+        the pipe and are completed together as their responses arrive.
+        
+        Args:
+            server_name: Name of a connected server
+            
+        Returns:
+            Initialized MCP client session
+        """
+        client = self._mcp_clients.get(server_name)
+        if client is not None:
+            return client
+        
+        # Concurrent first calls must not spawn the server twice
+        lock = self._mcp_locks.setdefault(server_name, asyncio.Lock())
+        async with lock:
+            client = self._mcp_clients.get(server_name)
+            if client is not None:
+                return client
+            
+            ready = asyncio.get_running_loop().create_future()
+            closing = asyncio.Event()
+            owner = asyncio.create_task(
+                self._own_session(server_name, ready, closing),
+                name=f"{self.name}-{server_name}-session"
+            )
+            self._mcp_owners[server_name] = owner
+            self._mcp_closing[server_name] = closing
+            try:
+                client = await ready
+            except BaseException:
+                # Failed to open, or the caller gave up waiting
+                closing.set()
+                raise
+            
+            self._mcp_clients[server_name] = client
+            return client
+    
+    async def _own_session(self, server_name: str, ready: asyncio.Future,
+                           closing: asyncio.Event) -> None:
+        """Open a server's session, hold it until closing is set, then close it."""
+        server_params = self._connected_servers[server_name]["params"]
+        try:
+            async with stdio_client(server_params) as (read, write, client):
+                await client.initialize()
+                ready.set_result(client)
+                await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                self.logger.warning(f"Session for {server_name} closed unexpectedly: {e}")
+        finally:
+            if not ready.done():
+                ready.set_exception(ConnectionError(f"Session for {server_name} was cancelled"))
+            # The next call reopens the session unless a newer owner exists
+            if self._mcp_owners.get(server_name) is asyncio.current_task():
+                self._mcp_owners.pop(server_name, None)
+                self._mcp_closing.pop(server_name, None)
+                self._mcp_clients.pop(server_name, None)
+    
+    async def _disconnect_server(self, server_name: str) -> None:
+        """Close a server's persistent session; the next call reopens it."""
+        self._mcp_clients.pop(server_name, None)
+        owner = self._mcp_owners.pop(server_name, None)
+        closing = self._mcp_closing.pop(server_name, None)
+        if owner is None:
+            return
+        
+        # The owner logs its own errors; this only waits for it to finish
+        closing.set()
+        await asyncio.gather(owner, return_exceptions=True)
+    
+    async def disconnect(self) -> None:
+        """Close the persistent sessions to all connected servers."""
+        for server_name in list(self._mcp_owners):
+            await self._disconnect_server(server_name)
+    
     async def call_tool(self, tool_name: str, parameters: Dict[str, Any]) -> CallToolResult:
         """
         Call an MCP tool with the given parameters.
@@ -191,23 +292,50 @@ class BaseAgent(ABC):
         if server_name not in self._connected_servers:
             raise ValueError(f"Server '{server_name}' not connected")
         
-        server_params = self._connected_servers[server_name]["params"]
-        
         try:
             self.logger.debug(f"Calling tool {tool_name} with parameters: {parameters}")
             
-            async with stdio_client(server_params) as (read, write, client):
-                await client.initialize()
-                result = await client.call_tool(tool_name, parameters)
-                
-                self.logger.debug(f"Tool {tool_name} returned: {result}")
-                return result
+            client = await self._get_client(server_name)
+            result = await client.call_tool(tool_name, parameters)
+            
+            self.logger.debug(f"Tool {tool_name} returned: {result}")
+            return result
                 
         except Exception as e:
             self.logger.error(f"Tool call failed - {tool_name}: {e}")
             self._error_count += 1
+            # Other calls may still be sharing the session; only a broken
+            # transport is worth reopening
+            if isinstance(e, _TRANSPORT_ERRORS):
+                await self._disconnect_server(server_name)
             raise
     
+    async def call_tools_batch(self, calls: List[Dict[str, Any]],
+                               batch_tool: str = "batch_call") -> List[Dict[str, Any]]:
+        """
+        Submit several tool calls to a server in a single request.
+        
+        The server's batch tool takes ``{"requests": [...]}`` and replies with
+        a one-line header, a blank line and a JSON list holding one entry per
+        request, in order.
+        
+        Args:
+            calls: Requests as ``{"tool": name, "arguments": {...}}`` dicts
+            batch_tool: Name of the server's batch tool
+            
+        Returns:
+            Per-request results with a ``status`` and either ``text`` or ``error``
+        """
+        if not calls:
+            return []
+        
+        result = await self.call_tool(batch_tool, {"requests": calls})
+        text = result.content[0].text
+        if result.isError:
+            raise RuntimeError(f"Batch call failed: {text}")
+        
+        return orjson.loads(text.partition("\n\n")[2])
+    
     async def read_resource(self, resource_uri: str) -> str:
         """
         Read content from an MCP resource.
@@ -223,16 +351,16 @@ class BaseAgent(ABC):
         
         resource_info = self._available_resources[resource_uri]
         server_name = resource_info["server"]
-        server_params = self._connected_servers[server_name]["params"]
         
         try:
-            async with stdio_client(server_params) as (read, write, client):
-                await client.initialize()
-                content = await client.read_resource(resource_uri)
-                return content
+            client = await self._get_client(server_name)
+            content = await client.read_resource(resource_uri)
+            return content
                 
         except Exception as e:
             self.logger.error(f"Resource read failed - {resource_uri}: {e}")
+            if isinstance(e, _TRANSPORT_ERRORS):
+                await self._disconnect_server(server_name)
             raise
     
     def get_available_tools(self) -> Dict[str, Dict[str, Any]]:
@@ -254,7 +382,7 @@ class BaseAgent(ABC):
             True if agent can handle the task
         """
         # Check if task type is supported
-        if task.type not in self.registration.supported_task_types:
+        if task.type not in self._supported_types:
             return False
         
         # Check if we have capacity for more tasks
@@ -366,6 +494,7 @@ class BaseAgent(ABC):
         """Stop the agent and clean up resources."""
         self.status = AgentStatus.OFFLINE
         self.current_tasks.clear()
+        await self.disconnect()
         self._connected_servers.clear()
         self._available_tools.clear()
         self._available_resources.clear()
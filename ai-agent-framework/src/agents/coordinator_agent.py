@@ -7,19 +7,180 @@ the overall system. This agent uses both task management and communication
 servers to orchestrate complex multi-agent operations.
 """
 
+import asyncio
+import hashlib
+import json
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, AsyncIterator, NamedTuple, Optional, List, Set
 
 # Add the project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.agents.base_agent import BaseAgent
+from src.agents.task_agent import _parse_task_count
 from src.core.types import (
     Task, TaskResult, Context, AgentRegistration, MCPServerConfig
 )
 
 
+@dataclass(slots=True)
+class OrchestrationState:
+    """Bookkeeping for a workflow the coordinator is orchestrating."""
+    workflow_name: str
+    step_count: int
+    step_names: List[Optional[str]]
+    strategy: str
+    status: str = "initializing"
+    created_tasks: List[str] = field(default_factory=list)
+    completed_steps: List[str] = field(default_factory=list)
+    failed_steps: List[str] = field(default_factory=list)
+    participating_agents: Set[str] = field(default_factory=set)
+
+
+@dataclass(slots=True)
+class _ExecutionState:
+    """Progress of a single complex-workflow execution."""
+    execution_id: str = ""
+    workflow_name: Optional[str] = None
+    total_phases: int = 0
+    status: str = "initializing"
+    current_phase: int = 0
+    completed_phases: List[str] = field(default_factory=list)
+    failed_phases: List[str] = field(default_factory=list)
+
+
+class OrchestrationResult(NamedTuple):
+    """Outcome of orchestrating a workflow, or of a complex-workflow phase."""
+    status: str
+    details: Dict[str, Any]
+
+
+# Interned so per-phase status checks compare by identity in CPython
+_STATUS_EXECUTING = sys.intern("executing")
+_STATUS_FAILED = sys.intern("failed")
+
+# Step strategy for a complex-workflow phase that does not declare a "type"
+DEFAULT_PHASE_TYPE = "sequential"
+
+# Task priorities accepted by the task management server's create_task tool
+MAX_TASK_PRIORITY = 10
+
+# MCP tools each coordination task type relies on
+_TOOLS_USED_BY_TASK_TYPE: Dict[str, tuple[str, ...]] = {
+    "orchestrate_workflow": ("create_task", "broadcast_message", "send_message"),
+    "coordinate_agents": ("get_agent_workload", "send_message", "broadcast_message"),
+    "allocate_resources": ("send_message",),
+    "resolve_conflicts": ("broadcast_message", "send_message"),
+    "monitor_system": ("get_task_counts", "list_tasks", "get_agent_workload", "broadcast_message"),
+    "handle_emergencies": ("broadcast_message",),
+    "manage_communications": ("list_channels", "get_messages", "broadcast_message_batch"),
+    "execute_complex_workflow": (
+        "create_task", "broadcast_message", "broadcast_message_batch", "send_message", "channel_subscribers"
+    )
+}
+
+# Queued broadcasts are flushed automatically once this many accumulate
+BROADCAST_BATCH_SIZE = 10
+
+# Executions whose successful phase results are kept for a retry
+MAX_PHASE_CACHE_SIZE = 256
+
+# Message subjects and bodies shared across coordination handlers
+_SUB_WORKLOAD = "Workload Alert"
+_MSG_WORKLOAD = "Your current workload is at capacity. Consider delegating or requesting assistance."
+_SUB_AVAILABLE = "Available for Work"
+_MSG_AVAILABLE = "You have available capacity. Ready to take on additional tasks."
+_SUB_MEDIATION = "Conflict Resolution - Mediation"
+_MSG_MEDIATION = "Coordinator is mediating resource conflict. Please pause conflicting operations and await resolution."
+_SUB_CONFLICT = "Conflict Resolution"
+_SUB_DEPENDENCY_CONFLICT = "Dependency Conflict Resolution"
+_MSG_DEPENDENCY_CONFLICT = "Task dependency conflict detected. Coordinator is resolving execution order."
+_SUB_CRITICAL_HALT = "CRITICAL EMERGENCY - HALT OPERATIONS"
+_MSG_CRITICAL_HALT = "Critical emergency detected. Please halt all non-essential operations immediately."
+
+# Single-argument message templates
+_TPL_CHANNEL_DESCRIPTION = "Coordination channel: %s"
+_TPL_ALLOCATION_SUBJECT = "Resource Allocation: %s"
+_TPL_CONFLICT_PRIORITY = "Your priority for resource access is %d. Please coordinate accordingly."
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _parse_embedded_json(text: str, open_chars: str = "{[") -> Any:
+    """
+    Parse the JSON value embedded in a tool's text response.
+    
+    MCP tools in this framework prefix their JSON payloads with a prose
+    header, so decoding starts at the earliest of ``open_chars`` and stops
+    at the end of that value, ignoring anything that follows.
+    
+    Args:
+        text: Tool response text
+        open_chars: Characters that may open the embedded value
+        
+    Returns:
+        The decoded value, or None if the text contains no opening character
+    """
+    start = min((i for i in (text.find(c) for c in open_chars) if i != -1), default=-1)
+    if start == -1:
+        return None
+    value, _ = _JSON_DECODER.raw_decode(text, start)
+    return value
+
+
+class _PhaseFailed(Exception):
+    """Raised inside fail-fast phase groups to cancel sibling phases."""
+    
+    def __init__(self, outcome: tuple):
+        super().__init__(f"Phase {outcome[0]} failed")
+        self.outcome = outcome
+
+
+def _phase_fingerprint(name: str, steps: List[Dict[str, Any]], strategy: str) -> str:
+    """Hash a phase definition so a retried execution can find its cached results."""
+    spec = json.dumps({"name": name, "steps": steps, "strategy": strategy}, sort_keys=True, default=str)
+    return hashlib.sha256(spec.encode()).hexdigest()
+
+
+def _step_criticality(steps: List[Dict[str, Any]], chained: bool) -> List[int]:
+    """
+    Compute the critical-path length of each workflow step.
+    
+    A step's criticality is 1 plus the longest chain of steps that depend on
+    it, so steps at the head of long dependency chains score highest. Steps
+    declare predecessors via ``depends_on`` (step names or indices); when
+    ``chained`` is set every step also depends on the one before it.
+    
+    Args:
+        steps: Workflow step definitions
+        chained: Whether steps implicitly depend on their predecessor
+        
+    Returns:
+        Criticality for each step, aligned with ``steps``
+    """
+    index = {step.get("name", f"step_{i+1}"): i for i, step in enumerate(steps)}
+    successors: List[List[int]] = [[] for _ in steps]
+    
+    for i, step in enumerate(steps):
+        predecessors = {i - 1} if chained and i > 0 else set()
+        for dep in step.get("depends_on", []):
+            j = dep if isinstance(dep, int) else index.get(dep)
+            # Only earlier steps can be predecessors, which keeps the graph acyclic
+            if j is not None and 0 <= j < i:
+                predecessors.add(j)
+        for j in predecessors:
+            successors[j].append(i)
+    
+    # Walk bottom-up so every successor is scored before its predecessors
+    criticality = [0] * len(steps)
+    for i in reversed(range(len(steps))):
+        criticality[i] = 1 + max((criticality[j] for j in successors[i]), default=0)
+    
+    return criticality
+
+
 class CoordinatorAgent(BaseAgent):
     """
     Master coordination agent for multi-agent orchestration.
@@ -33,6 +194,32 @@ class CoordinatorAgent(BaseAgent):
     - Error recovery and fault tolerance
     """
     
+    # Broadcast payload templates; subject and content are str.format strings
+    _COORDINATION_POINT_MESSAGE = {
+        "channel": "coordination",
+        "message_type": "coordination",
+        "subject": "Coordination Point: {phase}",
+        "content": "Reached coordination point before phase '{phase}'. All agents synchronize."
+    }
+    _WORKFLOW_COMPLETE_MESSAGE = {
+        "channel": "coordination",
+        "message_type": "announcement",
+        "subject": "Complex Workflow Complete: {workflow}",
+        "content": "Workflow '{workflow}' execution finished. Status: {status}"
+    }
+    _WORKFLOW_ABORTED_MESSAGE = {
+        "channel": "coordination",
+        "message_type": "announcement",
+        "subject": "Complex Workflow Aborted: {workflow}",
+        "content": "Workflow '{workflow}' aborted after a failed phase."
+    }
+    _SYSTEM_STATUS_MESSAGE = {
+        "channel": "main",
+        "message_type": "info",
+        "subject": "System Status Update",
+        "content": "Coordinator reporting: System operational. Active orchestrations: {active}"
+    }
+    
     def __init__(self):
         registration = AgentRegistration(
             name="coordinator_agent",
@@ -68,10 +255,32 @@ class CoordinatorAgent(BaseAgent):
         super().__init__("coordinator_agent", registration)
         
         # Coordination state
-        self._active_orchestrations: Dict[str, Dict[str, Any]] = {}
+        self._active_orchestrations: Dict[str, OrchestrationState] = {}
+        self._active_count = 0  # Mirrors len(self._active_orchestrations)
         self._agent_registry: Dict[str, Dict[str, Any]] = {}
         self._resource_allocations: Dict[str, Dict[str, Any]] = {}
         self._communication_channels: List[str] = []
+        self._pending_broadcasts: List[Dict[str, Any]] = []
+        # Successful phase results per execution (task id), kept only until
+        # the execution completes so a retry of the same task can skip them
+        self._phase_cache: Dict[str, Dict[str, OrchestrationResult]] = {}
+        
+        # Dispatch tables, built once per agent
+        self._task_handlers = {
+            "orchestrate_workflow": self._handle_orchestrate_workflow,
+            "coordinate_agents": self._handle_coordinate_agents,
+            "allocate_resources": self._handle_allocate_resources,
+            "resolve_conflicts": self._handle_resolve_conflicts,
+            "monitor_system": self._handle_monitor_system,
+            "handle_emergencies": self._handle_emergencies,
+            "manage_communications": self._handle_manage_communications,
+            "execute_complex_workflow": self._handle_execute_complex_workflow
+        }
+        self._comm_actions = {
+            "status_check": self._status_check,
+            "broadcast_status": self._broadcast_status,
+            "clean_channels": self._clean_channels
+        }
     
     async def setup(self) -> bool:
         """Setup the coordinator agent by connecting to all required servers."""
@@ -84,7 +293,8 @@ class CoordinatorAgent(BaseAgent):
                 args=["src/servers/task_management_server.py"],
                 tools=[
                     "create_task", "get_task", "update_task_status", "list_tasks",
-                    "get_next_task", "register_agent", "get_task_history", "get_agent_workload"
+                    "get_next_task", "register_agent", "get_task_history", "get_agent_workload",
+                    "get_task_counts"
                 ],
                 resources=["task_queue", "task_history", "agent_registry"]
             )
@@ -101,7 +311,8 @@ class CoordinatorAgent(BaseAgent):
                 command="python",
                 args=["src/servers/communication_server.py"],
                 tools=[
-                    "send_message", "broadcast_message", "get_messages", "create_channel",
+                    "send_message", "broadcast_message", "broadcast_message_batch",
+                    "get_messages", "create_channel", "channel_subscribers",
                     "join_channel", "leave_channel", "list_channels", "mark_message_read"
                 ],
                 resources=["message_queue", "channels", "communication_stats"]
@@ -124,7 +335,7 @@ class CoordinatorAgent(BaseAgent):
                 try:
                     await self.call_tool("create_channel", {
                         "name": channel_name,
-                        "description": f"Coordination channel: {channel_name}",
+                        "description": _TPL_CHANNEL_DESCRIPTION % (channel_name,),
                         "created_by": self.name
                     })
                     self._communication_channels.append(channel_name)
@@ -146,28 +357,54 @@ class CoordinatorAgent(BaseAgent):
     
     async def _execute_task_specific(self, task: Task, context: Optional[Context]) -> Dict[str, Any]:
         """Execute coordination-specific tasks."""
-        
-        if task.type == "orchestrate_workflow":
-            return await self._handle_orchestrate_workflow(task)
-        elif task.type == "coordinate_agents":
-            return await self._handle_coordinate_agents(task)
-        elif task.type == "allocate_resources":
-            return await self._handle_allocate_resources(task)
-        elif task.type == "resolve_conflicts":
-            return await self._handle_resolve_conflicts(task)
-        elif task.type == "monitor_system":
-            return await self._handle_monitor_system(task)
-        elif task.type == "handle_emergencies":
-            return await self._handle_emergencies(task)
-        elif task.type == "manage_communications":
-            return await self._handle_manage_communications(task)
-        elif task.type == "execute_complex_workflow":
-            return await self._handle_execute_complex_workflow(task)
-        else:
+        handler = self._task_handlers.get(task.type)
+        if handler is None:
             raise ValueError(f"Unsupported task type: {task.type}")
+        return await handler(task)
+    
+    def _build_message(self, template: Dict[str, Any], **fields: Any) -> Dict[str, Any]:
+        """Build a broadcast payload from a class-level template."""
+        message = template.copy()
+        message["from_agent"] = self.name
+        message["subject"] = message["subject"].format(**fields)
+        message["content"] = message["content"].format(**fields)
+        return message
+    
+    async def _queue_broadcast(self, message: Dict[str, Any]) -> None:
+        """Queue a broadcast, flushing the queue once it reaches the batch size."""
+        self._pending_broadcasts.append(message)
+        if len(self._pending_broadcasts) >= BROADCAST_BATCH_SIZE:
+            await self._flush_broadcasts()
+    
+    async def _flush_broadcasts(self) -> None:
+        """Send all queued broadcasts in a single broadcast_message_batch call."""
+        if not self._pending_broadcasts:
+            return
+        
+        # Swap the queue out first so broadcasts queued while we await go to the next batch
+        batch, self._pending_broadcasts = self._pending_broadcasts, []
+        await self.call_tool("broadcast_message_batch", {"messages": batch})
+    
+    async def _has_channel_subscribers(self, channel: str) -> bool:
+        """Check whether any agent besides the coordinator listens on a channel."""
+        try:
+            result = await self.call_tool("channel_subscribers", {
+                "channel": channel,
+                "exclude_agent": self.name
+            })
+            info = _parse_embedded_json(result.content[0].text, "{")
+            return info is None or info.get("count", 0) > 0
+        except Exception as e:
+            # Fail open so broadcasts are never dropped on a lookup error
+            self.logger.debug(f"Subscriber lookup failed for {channel}: {e}")
+            return True
     
     async def _handle_orchestrate_workflow(self, task: Task) -> Dict[str, Any]:
         """Orchestrate a complex multi-agent workflow."""
+        return (await self._orchestrate(task)).details
+    
+    async def _orchestrate(self, task: Task) -> OrchestrationResult:
+        """Create and announce the tasks for a workflow, returning a typed result."""
         workflow_name = task.parameters.get("name")
         workflow_steps = task.parameters.get("steps", [])
         coordination_strategy = task.parameters.get("strategy", "sequential")
@@ -180,16 +417,15 @@ class CoordinatorAgent(BaseAgent):
         
         # Create orchestration record
         orchestration_id = f"orch_{workflow_name}_{task.id}"
-        self._active_orchestrations[orchestration_id] = {
-            "workflow_name": workflow_name,
-            "steps": workflow_steps,
-            "strategy": coordination_strategy,
-            "status": "initializing",
-            "created_tasks": [],
-            "completed_steps": [],
-            "failed_steps": [],
-            "participating_agents": set()
-        }
+        orchestration = OrchestrationState(
+            workflow_name=workflow_name,
+            step_count=len(workflow_steps),
+            step_names=[step.get("name") for step in workflow_steps],
+            strategy=coordination_strategy
+        )
+        if orchestration_id not in self._active_orchestrations:
+            self._active_count += 1
+        self._active_orchestrations[orchestration_id] = orchestration
         
         # Announce workflow start
         await self.call_tool("broadcast_message", {
@@ -203,6 +439,10 @@ class CoordinatorAgent(BaseAgent):
         created_tasks = []
         step_results = []
         
+        # Steps heading longer dependency chains get higher priority so the
+        # scheduler works the critical path first
+        criticality = _step_criticality(workflow_steps, chained=coordination_strategy == "sequential")
+        
         if coordination_strategy == "sequential":
             # Execute steps sequentially with coordination
             prev_task_id = None
@@ -233,7 +473,7 @@ class CoordinatorAgent(BaseAgent):
                     "type": step_type,
                     "description": f"Workflow step: {step_name}",
                     "parameters": step_params,
-                    "priority": step.get("priority", 7),
+                    "priority": step.get("priority", min(7 + criticality[i] - 1, MAX_TASK_PRIORITY)),
                     "dependencies": dependencies,
                     "assigned_agent": step_agent
                 })
@@ -241,16 +481,14 @@ class CoordinatorAgent(BaseAgent):
                 # Extract task ID
                 result_text = create_result.content[0].text
                 try:
-                    import json
-                    json_start = result_text.find('{')
-                    if json_start != -1:
-                        task_info = json.loads(result_text[json_start:])
+                    task_info = _parse_embedded_json(result_text, "{")
+                    if task_info is not None:
                         task_id = task_info.get("task_id")
                         created_tasks.append(task_id)
                         prev_task_id = task_id
                         
                         if step_agent:
-                            self._active_orchestrations[orchestration_id]["participating_agents"].add(step_agent)
+                            orchestration.participating_agents.add(step_agent)
                         
                         step_results.append({
                             "step": step_name,
@@ -268,12 +506,20 @@ class CoordinatorAgent(BaseAgent):
         
         elif coordination_strategy == "parallel":
             # Execute steps in parallel with coordination
+            step_task_ids: Dict[Any, str] = {}
+            
             for i, step in enumerate(workflow_steps):
                 step_name = step.get("name", f"step_{i+1}")
                 step_agent = step.get("agent")
                 step_type = step.get("type")
                 step_params = step.get("parameters", {})
                 
+                # Honour explicit dependencies on steps that were already created
+                dependencies = [
+                    step_task_ids[dep] for dep in step.get("depends_on", [])
+                    if dep in step_task_ids
+                ]
+                
                 # Notify agent
                 if step_agent:
                     await self.call_tool("send_message", {
@@ -289,23 +535,22 @@ class CoordinatorAgent(BaseAgent):
                     "type": step_type,
                     "description": f"Parallel workflow step: {step_name}",
                     "parameters": step_params,
-                    "priority": step.get("priority", 6),
-                    "dependencies": [],
+                    "priority": step.get("priority", min(6 + criticality[i] - 1, MAX_TASK_PRIORITY)),
+                    "dependencies": dependencies,
                     "assigned_agent": step_agent
                 })
                 
                 # Process result
                 result_text = create_result.content[0].text
                 try:
-                    import json
-                    json_start = result_text.find('{')
-                    if json_start != -1:
-                        task_info = json.loads(result_text[json_start:])
+                    task_info = _parse_embedded_json(result_text, "{")
+                    if task_info is not None:
                         task_id = task_info.get("task_id")
                         created_tasks.append(task_id)
+                        step_task_ids[i] = step_task_ids[step_name] = task_id
                         
                         if step_agent:
-                            self._active_orchestrations[orchestration_id]["participating_agents"].add(step_agent)
+                            orchestration.participating_agents.add(step_agent)
                         
                         step_results.append({
                             "step": step_name,
@@ -320,8 +565,9 @@ class CoordinatorAgent(BaseAgent):
                     })
         
         # Update orchestration state
-        self._active_orchestrations[orchestration_id]["created_tasks"] = created_tasks
-        self._active_orchestrations[orchestration_id]["status"] = "executing"
+        orchestration.created_tasks = created_tasks
+        orchestration.status = _STATUS_EXECUTING
+        participating = sorted(orchestration.participating_agents)
         
         # Send summary to coordination channel
         await self.call_tool("broadcast_message", {
@@ -329,19 +575,19 @@ class CoordinatorAgent(BaseAgent):
             "channel": "coordination",
             "message_type": "info",
             "subject": f"Workflow Status: {workflow_name}",
-            "content": f"Created {len(created_tasks)} tasks for workflow '{workflow_name}'. Participating agents: {list(self._active_orchestrations[orchestration_id]['participating_agents'])}"
+            "content": f"Created {len(created_tasks)} tasks for workflow '{workflow_name}'. Participating agents: {participating}"
         })
         
-        return {
+        return OrchestrationResult(_STATUS_EXECUTING, {
             "orchestration_id": orchestration_id,
             "workflow_name": workflow_name,
             "coordination_strategy": coordination_strategy,
             "total_steps": len(workflow_steps),
             "created_tasks": created_tasks,
             "step_results": step_results,
-            "participating_agents": list(self._active_orchestrations[orchestration_id]["participating_agents"]),
-            "status": "executing"
-        }
+            "participating_agents": participating,
+            "status": _STATUS_EXECUTING
+        })
     
     async def _handle_coordinate_agents(self, task: Task) -> Dict[str, Any]:
         """Coordinate interaction between multiple agents."""
@@ -360,10 +606,8 @@ class CoordinatorAgent(BaseAgent):
         if coordination_type == "workload_balance":
             # Balance workload between agents
             try:
-                import json
-                json_start = workload_text.find('[')
-                if json_start != -1:
-                    agents_data = json.loads(workload_text[json_start:])
+                agents_data = _parse_embedded_json(workload_text, "[")
+                if agents_data is not None:
                     
                     # Find overloaded and underloaded agents
                     overloaded = []
@@ -379,26 +623,28 @@ class CoordinatorAgent(BaseAgent):
                             elif current_tasks < max_tasks / 2:
                                 underloaded.append(agent.get("name"))
                     
-                    # Send coordination messages
-                    for agent in overloaded:
-                        await self.call_tool("send_message", {
-                            "from_agent": self.name,
-                            "to_agent": agent,
-                            "message_type": "alert",
-                            "subject": "Workload Alert",
-                            "content": "Your current workload is at capacity. Consider delegating or requesting assistance."
-                        })
-                        coordination_actions.append(f"Notified {agent} of high workload")
+                    # Send coordination messages concurrently
+                    overloaded_message = {
+                        "from_agent": self.name,
+                        "message_type": "alert",
+                        "subject": _SUB_WORKLOAD,
+                        "content": _MSG_WORKLOAD
+                    }
+                    underloaded_message = {
+                        "from_agent": self.name,
+                        "message_type": "request",
+                        "subject": _SUB_AVAILABLE,
+                        "content": _MSG_AVAILABLE
+                    }
+                    await asyncio.gather(
+                        *[self.call_tool("send_message", {**overloaded_message, "to_agent": agent})
+                          for agent in overloaded],
+                        *[self.call_tool("send_message", {**underloaded_message, "to_agent": agent})
+                          for agent in underloaded]
+                    )
                     
-                    for agent in underloaded:
-                        await self.call_tool("send_message", {
-                            "from_agent": self.name,
-                            "to_agent": agent,
-                            "message_type": "request",
-                            "subject": "Available for Work",
-                            "content": "You have available capacity. Ready to take on additional tasks."
-                        })
-                        coordination_actions.append(f"Notified {agent} of available capacity")
+                    coordination_actions.extend(f"Notified {agent} of high workload" for agent in overloaded)
+                    coordination_actions.extend(f"Notified {agent} of available capacity" for agent in underloaded)
             
             except Exception as e:
                 coordination_actions.append(f"Error analyzing workload: {e}")
@@ -450,18 +696,16 @@ class CoordinatorAgent(BaseAgent):
             
             if allocation_strategy == "fair_share":
                 capacity_per_agent = total_capacity // len(requestors) if requestors else 0
-                for agent in requestors:
-                    allocation_plan[agent] = capacity_per_agent
+                allocation_plan = {agent: capacity_per_agent for agent in requestors}
             
             elif allocation_strategy == "priority_based":
-                # Get agent priorities and allocate accordingly
-                high_priority_agents = requestors[:len(requestors)//2]
-                low_priority_agents = requestors[len(requestors)//2:]
-                
-                for agent in high_priority_agents:
-                    allocation_plan[agent] = 60  # Higher allocation
-                for agent in low_priority_agents:
-                    allocation_plan[agent] = 40  # Lower allocation
+                # Get agent priorities and allocate accordingly: the first half
+                # gets the higher allocation, the rest the lower one
+                high_priority_count = len(requestors) // 2
+                allocation_plan = {
+                    agent: 60 if i < high_priority_count else 40
+                    for i, agent in enumerate(requestors)
+                }
         
         # Store allocation
         allocation_id = f"alloc_{resource_type}_{task.id}"
@@ -472,15 +716,18 @@ class CoordinatorAgent(BaseAgent):
             "timestamp": task.created_at.isoformat() if hasattr(task, 'created_at') else None
         }
         
-        # Notify agents of their allocations
-        for agent, allocation in allocation_plan.items():
-            await self.call_tool("send_message", {
+        # Notify agents of their allocations concurrently
+        allocation_subject = _TPL_ALLOCATION_SUBJECT % (resource_type,)
+        await asyncio.gather(*[
+            self.call_tool("send_message", {
                 "from_agent": self.name,
                 "to_agent": agent,
                 "message_type": "notification",
-                "subject": f"Resource Allocation: {resource_type}",
+                "subject": allocation_subject,
                 "content": f"You have been allocated {allocation} units of {resource_type}"
             })
+            for agent, allocation in allocation_plan.items()
+        ], return_exceptions=True)
         
         return {
             "allocation_id": allocation_id,
@@ -509,8 +756,8 @@ class CoordinatorAgent(BaseAgent):
                     "from_agent": self.name,
                     "target_agents": involved_parties,
                     "message_type": "coordination",
-                    "subject": "Conflict Resolution - Mediation",
-                    "content": "Coordinator is mediating resource conflict. Please pause conflicting operations and await resolution."
+                    "subject": _SUB_MEDIATION,
+                    "content": _MSG_MEDIATION
                 })
                 resolution_actions.append("Initiated mediation process")
                 
@@ -521,8 +768,8 @@ class CoordinatorAgent(BaseAgent):
                         "from_agent": self.name,
                         "to_agent": party,
                         "message_type": "notification",
-                        "subject": "Conflict Resolution",
-                        "content": f"Your priority for resource access is {priority}. Please coordinate accordingly."
+                        "subject": _SUB_CONFLICT,
+                        "content": _TPL_CONFLICT_PRIORITY % (priority,)
                     })
                     resolution_actions.append(f"Assigned priority {priority} to {party}")
         
@@ -532,8 +779,8 @@ class CoordinatorAgent(BaseAgent):
                 "from_agent": self.name,
                 "target_agents": involved_parties,
                 "message_type": "alert",
-                "subject": "Dependency Conflict Resolution",
-                "content": "Task dependency conflict detected. Coordinator is resolving execution order."
+                "subject": _SUB_DEPENDENCY_CONFLICT,
+                "content": _MSG_DEPENDENCY_CONFLICT
             })
             resolution_actions.append("Notified parties of dependency resolution")
         
@@ -556,30 +803,39 @@ class CoordinatorAgent(BaseAgent):
         # Get system status
         system_status = {}
         
+        # Query the task queue and agent workloads concurrently; get_task_counts
+        # answers for every status at once, older servers need a count-only
+        # list_tasks per status
+        task_statuses = ["pending", "running", "completed", "failed"]
+        if "get_task_counts" in self._available_tools:
+            count_calls = [self.call_tool("get_task_counts", {})]
+        else:
+            count_calls = [
+                self.call_tool("list_tasks", {"status": status, "count_only": True})
+                for status in task_statuses
+            ]
+        *count_results, workload_result = await asyncio.gather(
+            *count_calls,
+            self.call_tool("get_agent_workload", {})
+        )
+        
         # Monitor task queue
-        for status in ["pending", "running", "completed", "failed"]:
-            result = await self.call_tool("list_tasks", {
-                "status": status,
-                "limit": 1000
-            })
-            
-            result_text = result.content[0].text
-            if "Found" in result_text:
-                try:
-                    count = int(result_text.split("Found ")[1].split(" tasks")[0])
-                    system_status[f"tasks_{status}"] = count
-                except Exception:
-                    system_status[f"tasks_{status}"] = 0
+        if len(count_results) == 1:
+            counts = None
+            if not count_results[0].isError:
+                counts = _parse_embedded_json(count_results[0].content[0].text, "{")
+            for status in task_statuses:
+                system_status[f"tasks_{status}"] = counts.get(status, 0) if counts else 0
+        else:
+            for status, result in zip(task_statuses, count_results):
+                system_status[f"tasks_{status}"] = _parse_task_count(result.content[0].text)
         
         # Monitor agent health
-        workload_result = await self.call_tool("get_agent_workload", {})
         agent_count = 0
         try:
             workload_text = workload_result.content[0].text
-            import json
-            json_start = workload_text.find('[')
-            if json_start != -1:
-                agents_data = json.loads(workload_text[json_start:])
+            agents_data = _parse_embedded_json(workload_text, "[")
+            if agents_data is not None:
                 agent_count = len(agents_data)
                 system_status["total_agents"] = agent_count
                 system_status["active_agents"] = len([a for a in agents_data if a.get("status") == "online"])
@@ -590,19 +846,27 @@ class CoordinatorAgent(BaseAgent):
         # Check alert thresholds
         alerts = []
         if alert_thresholds:
+            get_metric = system_status.get
+            alert_message = {
+                "from_agent": self.name,
+                "channel": "alerts",
+                "message_type": "alert"
+            }
+            alert_broadcasts = []
+            
             for metric, threshold in alert_thresholds.items():
-                if metric in system_status and system_status[metric] > threshold:
-                    alert_msg = f"Alert: {metric} ({system_status[metric]}) exceeds threshold ({threshold})"
+                current = get_metric(metric)
+                if current is not None and current > threshold:
+                    alert_msg = f"Alert: {metric} ({current}) exceeds threshold ({threshold})"
                     alerts.append(alert_msg)
-                    
-                    # Send alert
-                    await self.call_tool("broadcast_message", {
-                        "from_agent": self.name,
-                        "channel": "alerts",
-                        "message_type": "alert",
+                    alert_broadcasts.append(self.call_tool("broadcast_message", {
+                        **alert_message,
                         "subject": f"System Alert: {metric}",
                         "content": alert_msg
-                    })
+                    }))
+            
+            # Send alerts concurrently
+            await asyncio.gather(*alert_broadcasts)
         
         return {
             "monitoring_scope": monitoring_scope,
@@ -639,8 +903,8 @@ class CoordinatorAgent(BaseAgent):
                 "from_agent": self.name,
                 "channel": "coordination",
                 "message_type": "alert",
-                "subject": "CRITICAL EMERGENCY - HALT OPERATIONS",
-                "content": "Critical emergency detected. Please halt all non-essential operations immediately.",
+                "subject": _SUB_CRITICAL_HALT,
+                "content": _MSG_CRITICAL_HALT,
                 "priority": 10
             })
             emergency_actions.append("Ordered halt of non-essential operations")
@@ -659,41 +923,15 @@ class CoordinatorAgent(BaseAgent):
     
     async def _handle_manage_communications(self, task: Task) -> Dict[str, Any]:
         """Manage system-wide communications."""
-        action = task.parameters.get("action", "status_check")
-        channel = task.parameters.get("channel")
-        message_filters = task.parameters.get("filters", {})
-        
-        self.logger.info(f"Managing communications: {action}")
+        params = task.parameters
+        action = params.get("action", "status_check")
+        channel = params.get("channel")
+        message_filters = params.get("filters", {})
         
-        communication_results = {}
+        self.logger.info("Managing communications: %s", action)
         
-        if action == "status_check":
-            # Check communication system status
-            channels_result = await self.call_tool("list_channels", {})
-            communication_results["channels"] = channels_result.content[0].text
-            
-            # Check messages
-            messages_result = await self.call_tool("get_messages", {
-                "agent_name": self.name,
-                "status": "all",
-                "limit": 10
-            })
-            communication_results["recent_messages"] = "Retrieved recent messages"
-        
-        elif action == "broadcast_status":
-            # Broadcast system status
-            await self.call_tool("broadcast_message", {
-                "from_agent": self.name,
-                "channel": "main",
-                "message_type": "info",
-                "subject": "System Status Update",
-                "content": f"Coordinator reporting: System operational. Active orchestrations: {len(self._active_orchestrations)}"
-            })
-            communication_results["broadcast_sent"] = True
-        
-        elif action == "clean_channels":
-            # Clean up communication channels
-            communication_results["cleanup_actions"] = "Channel cleanup initiated"
+        handler = self._comm_actions.get(action)
+        communication_results = await handler(task) if handler else {}
         
         return {
             "action": action,
@@ -703,11 +941,74 @@ class CoordinatorAgent(BaseAgent):
             "status": "completed"
         }
     
+    async def _status_check(self, task: Task) -> Dict[str, Any]:
+        """Check communication system status and recent messages concurrently."""
+        channels_coro = self.call_tool("list_channels", {})
+        messages_coro = self.call_tool("get_messages", {
+            "agent_name": self.name,
+            "status": "all",
+            "limit": 10
+        })
+        channels_result, messages_result = await asyncio.gather(channels_coro, messages_coro)
+        return {
+            "channels": channels_result.content[0].text,
+            "recent_messages": messages_result.content[0].text
+        }
+    
+    async def _broadcast_status(self, task: Task) -> Dict[str, Any]:
+        """Broadcast system status along with anything else queued."""
+        await self._queue_broadcast(self._build_message(
+            self._SYSTEM_STATUS_MESSAGE, active=self._active_count
+        ))
+        await self._flush_broadcasts()
+        return {"broadcast_sent": True}
+    
+    async def _clean_channels(self, task: Task) -> Dict[str, Any]:
+        """Clean up communication channels."""
+        return {"cleanup_actions": "Channel cleanup initiated"}
+    
     async def _handle_execute_complex_workflow(self, task: Task) -> Dict[str, Any]:
         """Execute a complex workflow involving multiple agents and coordination points."""
-        workflow_definition = task.parameters.get("workflow")
-        coordination_points = task.parameters.get("coordination_points", [])
-        failure_handling = task.parameters.get("failure_handling", "retry")
+        state = _ExecutionState()
+        phase_results = {
+            update["phase"]: update["result"]
+            async for update in self._stream_complex_workflow(task, state)
+        }
+        
+        completed_n = len(state.completed_phases)
+        failed_n = len(state.failed_phases)
+        
+        return {
+            "execution_id": state.execution_id,
+            "workflow_name": state.workflow_name,
+            "total_phases": state.total_phases,
+            "completed_phases": completed_n,
+            "failed_phases": failed_n,
+            "execution_status": state.status,
+            "phase_results": phase_results
+        }
+    
+    async def _stream_complex_workflow(self, task: Task,
+                                       state: _ExecutionState) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a complex workflow, yielding each phase's result as it finishes.
+        
+        Progress counters are recorded on ``state`` rather than accumulated
+        here, so consumers that only need the final status can discard each
+        result as it arrives. Stopping iteration early also skips the
+        completion announcement.
+        
+        Args:
+            task: The execute_complex_workflow task
+            state: Execution state to populate
+            
+        Yields:
+            ``{"phase": phase_name, "result": phase_result}`` per phase
+        """
+        params = task.parameters
+        workflow_definition = params.get("workflow")
+        coordination_points = params.get("coordination_points", ())
+        failure_handling = params.get("failure_handling", "retry")
         
         if not workflow_definition:
             raise ValueError("Workflow definition is required")
@@ -715,91 +1016,233 @@ class CoordinatorAgent(BaseAgent):
         workflow_name = workflow_definition.get("name")
         phases = workflow_definition.get("phases", [])
         
-        self.logger.info(f"Executing complex workflow: {workflow_name} with {len(phases)} phases")
+        # Coerce once so membership checks are O(1) and bad indices fail up front
+        coord_set = frozenset(int(point) for point in coordination_points)
         
-        # Create workflow execution record
-        execution_id = f"complex_{workflow_name}_{task.id}"
-        execution_state = {
-            "workflow_name": workflow_name,
-            "phases": phases,
-            "coordination_points": coordination_points,
-            "status": "initializing",
-            "current_phase": 0,
-            "completed_phases": [],
-            "failed_phases": [],
-            "phase_results": {}
-        }
+        total_phases = len(phases)
+        self.logger.info("Executing complex workflow: %s with %d phases", workflow_name, total_phases)
+        
+        state.execution_id = f"complex_{workflow_name}_{task.id}"
+        state.workflow_name = workflow_name
+        state.total_phases = total_phases
+        state.status = _STATUS_EXECUTING
+        
+        # Coordination points split the phases into segments. Phases within a
+        # segment only create their own tasks, so they run concurrently unless
+        # the workflow opts out with phase_execution "sequential". A phase's
+        # own "type" only picks the strategy for its steps.
+        concurrent_phases = workflow_definition.get("phase_execution", "concurrent") != "sequential"
+        segments: List[List[int]] = []
+        for i in range(total_phases):
+            if not segments or i in coord_set:
+                segments.append([])
+            segments[-1].append(i)
+        
+        # Coordination broadcasts are pointless if nobody is listening
+        has_coord_subs = bool(coord_set) and await self._has_channel_subscribers("coordination")
         
-        # Execute each phase
-        for i, phase in enumerate(phases):
-            phase_name = phase.get("name", f"phase_{i+1}")
-            phase_type = phase.get("type", "sequential")
-            phase_steps = phase.get("steps", [])
+        aborted = False
+        for segment in segments:
+            first = segment[0]
+            state.current_phase = first
             
-            self.logger.info(f"Executing phase {i+1}/{len(phases)}: {phase_name}")
+            # Check for coordination point; agents must hear about it before
+            # the phase starts, so this is also where queued broadcasts flush
+            if first in coord_set and has_coord_subs:
+                phase_name = phases[first].get("name", f"phase_{first+1}")
+                await self._queue_broadcast(self._build_message(
+                    self._COORDINATION_POINT_MESSAGE, phase=phase_name
+                ))
+                await self._flush_broadcasts()
             
-            # Check for coordination point
-            if i in coordination_points:
-                await self.call_tool("broadcast_message", {
-                    "from_agent": self.name,
-                    "channel": "coordination",
-                    "message_type": "coordination",
-                    "subject": f"Coordination Point: {phase_name}",
-                    "content": f"Reached coordination point before phase '{phase_name}'. All agents synchronize."
-                })
+            if len(segment) > 1 and concurrent_phases:
+                outcomes = await self._run_phases_concurrently(task, phases, segment, failure_handling == "abort")
+            else:
+                outcomes = []
+                for i in segment:
+                    try:
+                        outcome = await self._run_phase(task, phases, i)
+                    except Exception as e:
+                        outcome = self._phase_error(phases, i, e)
+                    outcomes.append(outcome)
+                    if outcome[1].status is not _STATUS_EXECUTING and failure_handling == "abort":
+                        break
             
-            # Execute phase using orchestrate_workflow logic
-            phase_result = await self._handle_orchestrate_workflow(Task(
-                id=f"{task.id}_phase_{i}",
-                type="orchestrate_workflow",
-                description=f"Phase {phase_name} of complex workflow",
-                parameters={
-                    "name": phase_name,
-                    "steps": phase_steps,
-                    "strategy": phase_type
-                }
-            ))
+            segment_failed = False
+            for phase_name, phase_result in outcomes:
+                if phase_result.status is _STATUS_EXECUTING:
+                    state.completed_phases.append(phase_name)
+                else:
+                    state.failed_phases.append(phase_name)
+                    segment_failed = True
+                    if failure_handling == "abort":
+                        aborted = True
+                
+                yield {"phase": phase_name, "result": phase_result.details}
             
-            execution_state["phase_results"][phase_name] = phase_result
+            # A failure makes cached results for this segment and everything
+            # downstream of it stale
+            if segment_failed:
+                self._invalidate_phase_cache(task.id, phases, first)
             
-            if phase_result.get("status") == "executing":
-                execution_state["completed_phases"].append(phase_name)
+            if aborted:
+                break
+        
+        state.status = "completed" if not state.failed_phases else "partial_failure"
+        
+        # Only a failed execution can be retried, so a clean run needs no cache
+        if not state.failed_phases:
+            self._phase_cache.pop(task.id, None)
+        
+        if aborted:
+            # The compact notice goes out with anything else still queued
+            await self._queue_broadcast(self._build_message(
+                self._WORKFLOW_ABORTED_MESSAGE, workflow=workflow_name
+            ))
+            await self._flush_broadcasts()
+        else:
+            await self._announce_completion(workflow_name, state.status)
+    
+    async def _announce_completion(self, workflow_name: str, status: str) -> None:
+        """Broadcast the final status of a complex workflow to the coordination channel."""
+        await self._queue_broadcast(self._build_message(
+            self._WORKFLOW_COMPLETE_MESSAGE, workflow=workflow_name, status=status
+        ))
+        await self._flush_broadcasts()
+    
+    async def _run_phase(self, task: Task, phases: List[Dict[str, Any]], i: int) -> tuple[str, OrchestrationResult]:
+        """Execute one complex-workflow phase using orchestrate_workflow logic."""
+        phase = phases[i]
+        phase_name = phase.get("name", f"phase_{i+1}")
+        phase_type = phase.get("type", DEFAULT_PHASE_TYPE)
+        phase_steps = phase.get("steps", [])
+        
+        self.logger.info("Executing phase %d/%d: %s", i + 1, len(phases), phase_name)
+        
+        # A retry of this execution reuses the tasks an identical phase
+        # already created
+        key = _phase_fingerprint(phase_name, phase_steps, phase_type)
+        cached = self._phase_cache.get(task.id, {}).get(key)
+        if cached is not None and cached.status is _STATUS_EXECUTING:
+            self.logger.info("Reusing cached result for phase %s", phase_name)
+            return phase_name, cached
+        
+        phase_result = await self._orchestrate(Task(
+            id=f"{task.id}_phase_{i}",
+            type="orchestrate_workflow",
+            description=f"Phase {phase_name} of complex workflow",
+            parameters={
+                "name": phase_name,
+                "steps": phase_steps,
+                "strategy": phase_type
+            }
+        ))
+        
+        if phase_result.status is _STATUS_EXECUTING:
+            if task.id not in self._phase_cache and len(self._phase_cache) >= MAX_PHASE_CACHE_SIZE:
+                # Evict the oldest execution; dicts preserve insertion order
+                del self._phase_cache[next(iter(self._phase_cache))]
+            self._phase_cache.setdefault(task.id, {})[key] = phase_result
+        
+        return phase_name, phase_result
+    
+    def _invalidate_phase_cache(self, task_id: str, phases: List[Dict[str, Any]], start: int) -> None:
+        """Drop an execution's cached results for every phase from ``start`` onwards."""
+        cached = self._phase_cache.get(task_id)
+        if not cached:
+            return
+        for i in range(start, len(phases)):
+            phase = phases[i]
+            key = _phase_fingerprint(
+                phase.get("name", f"phase_{i+1}"),
+                phase.get("steps", []),
+                phase.get("type", DEFAULT_PHASE_TYPE)
+            )
+            cached.pop(key, None)
+    
+    async def _run_phases_concurrently(self, task: Task, phases: List[Dict[str, Any]],
+                                       segment: List[int], abort_on_failure: bool) -> List[tuple[str, OrchestrationResult]]:
+        """
+        Execute a segment of independent phases concurrently.
+        
+        Phases that raise are reported as failed. When ``abort_on_failure`` is
+        set, the first failure cancels the phases still running and those
+        cancelled phases are left out of the results.
+        
+        Returns:
+            (phase_name, phase_result) pairs in segment order
+        """
+        if abort_on_failure:
+            runs = await self._run_phases_fail_fast(task, phases, segment)
+        else:
+            runs = [asyncio.create_task(self._run_phase(task, phases, i)) for i in segment]
+            await asyncio.gather(*runs, return_exceptions=True)
+        
+        outcomes = []
+        for i, run in zip(segment, runs):
+            if run.cancelled():
+                continue
+            error = run.exception()
+            if error is None:
+                outcomes.append(run.result())
+            elif isinstance(error, _PhaseFailed):
+                outcomes.append(error.outcome)
             else:
-                execution_state["failed_phases"].append(phase_name)
-                if failure_handling == "abort":
-                    break
+                outcomes.append(self._phase_error(phases, i, error))
         
-        execution_state["status"] = "completed" if not execution_state["failed_phases"] else "partial_failure"
+        return outcomes
+    
+    def _phase_error(self, phases: List[Dict[str, Any]], i: int,
+                     error: BaseException) -> tuple[str, OrchestrationResult]:
+        """
+        Record a phase that raised as failed.
         
-        # Final coordination message
-        await self.call_tool("broadcast_message", {
-            "from_agent": self.name,
-            "channel": "coordination",
-            "message_type": "announcement",
-            "subject": f"Complex Workflow Complete: {workflow_name}",
-            "content": f"Workflow '{workflow_name}' execution finished. Status: {execution_state['status']}"
-        })
+        Both the sequential and the concurrent paths report a raising phase
+        this way, so one bad phase never takes down the whole workflow.
         
-        return {
-            "execution_id": execution_id,
-            "workflow_name": workflow_name,
-            "total_phases": len(phases),
-            "completed_phases": len(execution_state["completed_phases"]),
-            "failed_phases": len(execution_state["failed_phases"]),
-            "execution_status": execution_state["status"],
-            "phase_results": execution_state["phase_results"]
-        }
+        Returns:
+            (phase_name, failed phase_result) pair
+        """
+        phase_name = phases[i].get("name", f"phase_{i+1}")
+        self.logger.error(f"Phase {phase_name} failed: {error}")
+        return phase_name, OrchestrationResult(
+            _STATUS_FAILED, {"status": _STATUS_FAILED, "error": str(error)}
+        )
+    
+    async def _run_phases_fail_fast(self, task: Task, phases: List[Dict[str, Any]],
+                                    segment: List[int]) -> List[asyncio.Task]:
+        """
+        Run a segment's phases so the first failure cancels its siblings.
+        
+        Uses an asyncio.TaskGroup for structured cancellation, falling back to
+        asyncio.wait with explicit cancellation on Python versions without it.
+        
+        Returns:
+            The finished (or cancelled) task for each phase, in segment order
+        """
+        async def run_or_raise(i: int) -> tuple[str, OrchestrationResult]:
+            outcome = await self._run_phase(task, phases, i)
+            if outcome[1].status is not _STATUS_EXECUTING:
+                raise _PhaseFailed(outcome)
+            return outcome
+        
+        if hasattr(asyncio, "TaskGroup"):
+            runs: List[asyncio.Task] = []
+            try:
+                async with asyncio.TaskGroup() as group:
+                    runs.extend(group.create_task(run_or_raise(i)) for i in segment)
+            except Exception:
+                # Failures are read back from the individual tasks by the caller
+                pass
+            return runs
+        
+        runs = [asyncio.create_task(run_or_raise(i)) for i in segment]
+        _, pending = await asyncio.wait(runs, return_when=asyncio.FIRST_EXCEPTION)
+        for run in pending:
+            run.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return runs
     
     def _get_tools_used_in_task(self, task: Task) -> List[str]:
         """Return tools used for specific task types."""
-        tool_mapping = {
-            "orchestrate_workflow": ["create_task", "broadcast_message", "send_message"],
-            "coordinate_agents": ["get_agent_workload", "send_message", "broadcast_message"],
-            "allocate_resources": ["send_message"],
-            "resolve_conflicts": ["broadcast_message", "send_message"],
-            "monitor_system": ["list_tasks", "get_agent_workload", "broadcast_message"],
-            "handle_emergencies": ["broadcast_message"],
-            "manage_communications": ["list_channels", "get_messages", "broadcast_message"],
-            "execute_complex_workflow": ["create_task", "broadcast_message", "send_message"]
-        }
-        return tool_mapping.get(task.type, [])
\ No newline at end of file
+        return list(_TOOLS_USED_BY_TASK_TYPE.get(task.type, ()))
\ No newline at end of file
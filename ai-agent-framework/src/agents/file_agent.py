@@ -7,9 +7,17 @@ This agent connects to the file operations MCP server and provides
 intelligent file handling capabilities.
 """
 
+import asyncio
+import re
 import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Awaitable, Callable, Iterator, Optional, List
+
+import orjson
 
 # Add the project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
@@ -20,6 +28,129 @@ from src.core.types import (
 )
 
 
+# Seconds a list_directory/get_file_info result stays fresh
+METADATA_CACHE_TTL = 5.0
+
+# Entries kept per metadata cache before the least recently used is evicted
+MAX_METADATA_CACHE_SIZE = 256
+
+# Tool calls sent per batch_call request
+TOOL_BATCH_SIZE = 64
+
+# Extensions whose contents analyze_directory inspects
+_TEXT_EXTS = (".txt", ".md", ".py", ".json")
+
+
+# Runs of non-whitespace, the same words str.split() would return
+_WORD_RE = re.compile(r"\S+")
+
+# Characters with special meaning in a regular expression
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def _longest_literal(pattern: str) -> str:
+    """
+    Return a substring that every match of ``pattern`` must contain.
+    
+    Only simple patterns are analyzed: anything with alternation, groups,
+    character classes or escapes yields an empty string, meaning no
+    pre-filter is possible.
+    
+    Args:
+        pattern: Regular expression pattern
+        
+    Returns:
+        The longest required literal run, or "" if none can be determined
+    """
+    if any(c in pattern for c in "()[]\\|"):
+        return ""
+    
+    runs = []
+    current = ""
+    in_repeat = False
+    for c in pattern:
+        if in_repeat:
+            # Skip the bounds of a {m,n} repetition
+            in_repeat = c != "}"
+            continue
+        if c in _REGEX_METACHARS:
+            in_repeat = c == "{"
+            # A character followed by *, ? or {m,n} may match zero times
+            if c in "*?{" and current:
+                current = current[:-1]
+            runs.append(current)
+            current = ""
+        else:
+            current += c
+    runs.append(current)
+    return max(runs, key=len)
+
+
+def _count_lines(content: str) -> int:
+    """Count lines in text without building a list of them."""
+    return content.count('\n') + (1 if content and not content.endswith('\n') else 0)
+
+
+def _path_prefix(directory: str) -> str:
+    """Return the prefix that joins file names onto ``directory`` for tool arguments."""
+    if directory == ".":
+        return ""
+    return directory if directory.endswith("/") else directory + "/"
+
+
+def _count_words(content: str) -> int:
+    """Count whitespace-separated words without building a list of them."""
+    return sum(1 for _ in _WORD_RE.finditer(content))
+
+
+def _parse_tool_json(result: Any) -> Dict[str, Any]:
+    """
+    Parse the JSON payload of a file operations tool result.
+    
+    Structured tools (list_directory, list_tree, get_file_info, count_lines,
+    copy_file) prefix their JSON payload with a one-line header, followed by
+    a blank line.
+    
+    Args:
+        result: Result of a structured tool call
+        
+    Returns:
+        The decoded payload
+    """
+    return _parse_json_text(result.content[0].text)
+
+
+def _iter_listing(listing: Dict[str, Any]) -> Iterator[tuple[str, str, Optional[int]]]:
+    """
+    Yield ``(kind, name, size)`` for each entry of a parsed directory listing.
+    
+    Files come first, then directories (whose size is None). Accepts both
+    list_directory and list_tree payloads.
+    """
+    for entry in listing["files"]:
+        yield "file", entry["name"], entry["size"]
+    for entry in listing["directories"]:
+        yield "directory", entry if isinstance(entry, str) else entry["name"], None
+
+
+def _tree_totals(node: Dict[str, Any]) -> Dict[str, int]:
+    """Sum file, directory and byte counts over a list_tree node."""
+    totals = {
+        "files": len(node.get("files", ())),
+        "directories": len(node.get("directories", ())),
+        "size_bytes": sum(entry["size"] or 0 for entry in node.get("files", ()))
+    }
+    for child in node.get("directories", ()):
+        for key, value in _tree_totals(child).items():
+            totals[key] += value
+    return totals
+
+
+def _parse_json_text(text: str) -> Dict[str, Any]:
+    """Parse the JSON payload that follows a structured tool response's header."""
+    return orjson.loads(text.partition("\n\n")[2])
+
+
 class FileAgent(BaseAgent):
     """
     Specialized agent for file operations.
@@ -66,6 +197,24 @@ class FileAgent(BaseAgent):
         )
         
         super().__init__("file_agent", registration)
+        
+        # Short-lived metadata caches: key -> (fetched_at, tool result)
+        self._dir_cache: OrderedDict[tuple[str, bool], tuple[float, Any]] = OrderedDict()
+        self._info_cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        
+        # Task type -> handler
+        self._task_handlers = {
+            "read_file": self._handle_read_file,
+            "write_file": self._handle_write_file,
+            "list_directory": self._handle_list_directory,
+            "create_directory": self._handle_create_directory,
+            "delete_file": self._handle_delete_file,
+            "analyze_directory": self._handle_analyze_directory,
+            "search_files": self._handle_search_files,
+            "batch_process_files": self._handle_batch_process_files,
+            "organize_files": self._handle_organize_files,
+            "backup_files": self._handle_backup_files
+        }
     
     async def setup(self) -> bool:
         """Setup the file agent by connecting to required servers."""
@@ -78,7 +227,8 @@ class FileAgent(BaseAgent):
                 args=["src/servers/file_operations_server.py"],
                 tools=[
                     "read_file", "write_file", "list_directory", 
-                    "create_directory", "get_file_info", "delete_file"
+                    "create_directory", "get_file_info", "delete_file",
+                    "count_lines", "copy_file", "list_tree", "batch_call"
                 ],
                 resources=["file_system"]
             )
@@ -99,33 +249,14 @@ class FileAgent(BaseAgent):
     def _can_handle_task_specific(self, task: Task) -> bool:
         """Check if this agent can handle the specific task."""
         # File agent can handle all file-related tasks
-        return task.type in self.registration.supported_task_types
+        return task.type in self._supported_types
     
     async def _execute_task_specific(self, task: Task, context: Optional[Context]) -> Dict[str, Any]:
         """Execute file-specific tasks."""
-        
-        if task.type == "read_file":
-            return await self._handle_read_file(task)
-        elif task.type == "write_file":
-            return await self._handle_write_file(task)
-        elif task.type == "list_directory":
-            return await self._handle_list_directory(task)
-        elif task.type == "create_directory":
-            return await self._handle_create_directory(task)
-        elif task.type == "delete_file":
-            return await self._handle_delete_file(task)
-        elif task.type == "analyze_directory":
-            return await self._handle_analyze_directory(task)
-        elif task.type == "search_files":
-            return await self._handle_search_files(task)
-        elif task.type == "batch_process_files":
-            return await self._handle_batch_process_files(task)
-        elif task.type == "organize_files":
-            return await self._handle_organize_files(task)
-        elif task.type == "backup_files":
-            return await self._handle_backup_files(task)
-        else:
+        handler = self._task_handlers.get(task.type)
+        if handler is None:
             raise ValueError(f"Unsupported task type: {task.type}")
+        return await handler(task)
     
     async def _handle_read_file(self, task: Task) -> Dict[str, Any]:
         """Read a file and return its contents."""
@@ -137,25 +268,19 @@ class FileAgent(BaseAgent):
         
         self.logger.info(f"Reading file: {file_path}")
         
-        # Read file using MCP tool
+        # Read file using MCP tool; metadata arrives in the same response
         result = await self.call_tool("read_file", {"path": file_path})
         content = result.content[0].text
-        
-        # Get file metadata
-        info_result = await self.call_tool("get_file_info", {"path": file_path})
-        file_info = info_result.content[0].text
+        file_info = _parse_json_text(result.content[1].text)
         
         # Analyze content
-        lines = content.split('\n')
-        words = len(content.split())
-        
         return {
             "file_path": file_path,
             "content": content,
             "file_info": file_info,
             "analysis": {
-                "line_count": len(lines),
-                "word_count": words,
+                "line_count": _count_lines(content),
+                "word_count": _count_words(content),
                 "character_count": len(content),
                 "encoding": encoding
             },
@@ -180,6 +305,7 @@ class FileAgent(BaseAgent):
             if parent_dir != ".":
                 try:
                     await self.call_tool("create_directory", {"path": parent_dir})
+                    self._invalidate_cache(parent_dir)
                 except Exception:
                     pass  # Directory might already exist
         
@@ -189,6 +315,7 @@ class FileAgent(BaseAgent):
             "content": content,
             "mode": mode
         })
+        self._invalidate_cache(file_path)
         
         return {
             "file_path": file_path,
@@ -202,39 +329,29 @@ class FileAgent(BaseAgent):
         dir_path = task.parameters.get("path", ".")
         include_hidden = task.parameters.get("include_hidden", False)
         recursive = task.parameters.get("recursive", False)
+        depth = task.parameters.get("depth", 2)
         
         self.logger.info(f"Listing directory: {dir_path}")
         
-        # Get directory listing
-        result = await self.call_tool("list_directory", {
-            "path": dir_path,
-            "include_hidden": include_hidden
-        })
+        # Get directory listing; recursive listings are walked server-side in one call
+        if recursive:
+            result = await self.call_tool("list_tree", {
+                "path": dir_path,
+                "depth": depth,
+                "include_hidden": include_hidden
+            })
+        else:
+            result = await self._cached_list(dir_path, include_hidden)
         
         listing = result.content[0].text
         
         # Parse the listing for analysis
-        lines = listing.split('\n')[1:]  # Skip header
-        files = []
-        directories = []
-        
-        for line in lines:
-            if line.strip():
-                if line.startswith("file:"):
-                    files.append(line.split(": ", 1)[1].split(" (")[0])
-                elif line.startswith("directory:"):
-                    directories.append(line.split(": ", 1)[1])
-        
-        # If recursive, get subdirectory contents
-        if recursive and directories:
-            subdirs_content = {}
-            for subdir in directories[:5]:  # Limit to avoid deep recursion
-                try:
-                    subdir_path = f"{dir_path}/{subdir}" if dir_path != "." else subdir
-                    sub_result = await self.call_tool("list_directory", {"path": subdir_path})
-                    subdirs_content[subdir] = sub_result.content[0].text
-                except Exception as e:
-                    subdirs_content[subdir] = f"Error: {e}"
+        parsed = _parse_tool_json(result)
+        files = [entry["name"] for entry in parsed["files"]]
+        if recursive:
+            directories = [entry["name"] for entry in parsed["directories"]]
+        else:
+            directories = parsed["directories"]
         
         response = {
             "directory": dir_path,
@@ -246,7 +363,7 @@ class FileAgent(BaseAgent):
         }
         
         if recursive and directories:
-            response["subdirectories"] = subdirs_content
+            response["subdirectories"] = {entry["name"]: entry for entry in parsed["directories"]}
         
         return response
     
@@ -264,6 +381,7 @@ class FileAgent(BaseAgent):
             "path": dir_path,
             "parents": parents
         })
+        self._invalidate_cache(dir_path)
         
         return {
             "directory": dir_path,
@@ -288,6 +406,7 @@ class FileAgent(BaseAgent):
             "path": file_path,
             "recursive": recursive
         })
+        self._invalidate_cache(file_path)
         
         return {
             "deleted_path": file_path,
@@ -304,36 +423,20 @@ class FileAgent(BaseAgent):
         self.logger.info(f"Analyzing directory: {dir_path}")
         
         # Get directory listing
-        listing_result = await self.call_tool("list_directory", {
-            "path": dir_path,
-            "include_hidden": False
-        })
+        listing_result = await self._cached_list(dir_path)
         
         listing = listing_result.content[0].text
         
-        # Parse and analyze
-        lines = listing.split('\n')[1:]
+        # Parse and analyze in a single pass over the entries
         files = []
         directories = []
         total_size = 0
-        
-        for line in lines:
-            if line.strip():
-                if line.startswith("file:"):
-                    file_info = line.split(": ", 1)[1]
-                    if "(" in file_info and " bytes)" in file_info:
-                        file_name = file_info.split(" (")[0]
-                        size_str = file_info.split("(")[1].split(" bytes)")[0]
-                        try:
-                            size = int(size_str)
-                            total_size += size
-                        except ValueError:
-                            pass
-                    else:
-                        file_name = file_info
-                    files.append(file_name)
-                elif line.startswith("directory:"):
-                    directories.append(line.split(": ", 1)[1])
+        for kind, name, size in _iter_listing(_parse_tool_json(listing_result)):
+            if kind == "file":
+                files.append(name)
+                total_size += size or 0
+            else:
+                directories.append(name)
         
         analysis = {
             "directory": dir_path,
@@ -346,26 +449,47 @@ class FileAgent(BaseAgent):
             },
             "raw_listing": listing
         }
+        prefix = _path_prefix(dir_path)
+        
+        # Walk subdirectories down to the requested depth, one subtree per call
+        if depth > 1 and directories:
+            async def summarize_subtree(name: str) -> Dict[str, Any]:
+                try:
+                    result = await self.call_tool("list_tree", {"path": prefix + name, "depth": depth - 1})
+                    return _tree_totals(_parse_tool_json(result))
+                except Exception as e:
+                    return {"error": str(e)}
+            
+            subtree_totals = await self._gather_per_file(directories, summarize_subtree)
+            analysis["subdirectories"] = dict(zip(directories, subtree_totals))
+            
+            summary = analysis["summary"]
+            summary["recursive_files"] = len(files) + sum(t.get("files", 0) for t in subtree_totals)
+            summary["recursive_directories"] = len(directories) + sum(t.get("directories", 0) for t in subtree_totals)
+            summary["recursive_size_bytes"] = total_size + sum(t.get("size_bytes", 0) for t in subtree_totals)
         
         # Content analysis for text files
         if include_content_analysis and files:
-            content_analysis = {}
-            text_files = [f for f in files if any(f.endswith(ext) for ext in ['.txt', '.md', '.py', '.json'])]
+            # Analyze first 5 text files
+            text_files = list(islice((f for f in files if f.endswith(_TEXT_EXTS)), 5))
             
-            for file_name in text_files[:5]:  # Analyze first 5 text files
+            async def analyze_file(file_name: str) -> Dict[str, Any]:
                 try:
-                    file_path = f"{dir_path}/{file_name}" if dir_path != "." else file_name
+                    file_path = prefix + file_name
                     content_result = await self.call_tool("read_file", {"path": file_path})
                     content = content_result.content[0].text
                     
-                    content_analysis[file_name] = {
+                    return {
                         "size": len(content),
-                        "lines": len(content.split('\n')),
-                        "words": len(content.split()),
+                        "lines": _count_lines(content),
+                        "words": _count_words(content),
                         "preview": content[:200] + ("..." if len(content) > 200 else "")
                     }
                 except Exception as e:
-                    content_analysis[file_name] = {"error": str(e)}
+                    return {"error": str(e)}
+            
+            file_analyses = await self._gather_per_file(text_files, analyze_file)
+            content_analysis = dict(zip(text_files, file_analyses))
             
             analysis["content_analysis"] = content_analysis
         
@@ -384,22 +508,13 @@ class FileAgent(BaseAgent):
         self.logger.info(f"Searching files in {search_dir}")
         
         # Get directory listing
-        listing_result = await self.call_tool("list_directory", {"path": search_dir})
-        listing = listing_result.content[0].text
-        
-        # Extract file names
-        lines = listing.split('\n')[1:]
-        all_files = []
-        for line in lines:
-            if line.strip() and line.startswith("file:"):
-                file_name = line.split(": ", 1)[1].split(" (")[0]
-                all_files.append(file_name)
+        listing_result = await self._cached_list(search_dir)
+        all_files = [entry["name"] for entry in _parse_tool_json(listing_result)["files"]]
         
         matches = []
         
         # Name pattern matching
         if name_pattern:
-            import re
             pattern_re = re.compile(name_pattern, re.IGNORECASE)
             for file_name in all_files:
                 if pattern_re.search(file_name):
@@ -411,39 +526,59 @@ class FileAgent(BaseAgent):
         
         # Content pattern matching
         if content_pattern:
-            import re
             pattern_re = re.compile(content_pattern, re.IGNORECASE)
             
+            # Cheap substring checks rule out most files and lines before the
+            # regex runs; pure literals skip the regex entirely
+            is_literal = not any(c in _REGEX_METACHARS for c in content_pattern)
+            literal = (content_pattern if is_literal else _longest_literal(content_pattern)).lower()
+            
             # Filter by extensions if specified
-            search_files = all_files
+            search_files = iter(all_files)
             if file_extensions:
-                search_files = [f for f in all_files if any(f.endswith(ext) for ext in file_extensions)]
+                exts = tuple(file_extensions)
+                search_files = (f for f in all_files if f.endswith(exts))
+            prefix = _path_prefix(search_dir)
             
-            for file_name in search_files[:10]:  # Limit search to prevent overload
+            async def search_file(file_name: str) -> Optional[Dict[str, Any]]:
                 try:
-                    file_path = f"{search_dir}/{file_name}" if search_dir != "." else file_name
+                    file_path = prefix + file_name
                     content_result = await self.call_tool("read_file", {"path": file_path})
                     content = content_result.content[0].text
                     
-                    if pattern_re.search(content):
-                        # Find line numbers of matches
-                        lines = content.split('\n')
-                        match_lines = []
-                        for i, line in enumerate(lines, 1):
-                            if pattern_re.search(line):
-                                match_lines.append({
-                                    "line_number": i,
-                                    "content": line.strip()
-                                })
-                        
-                        matches.append({
+                    content_lower = content.lower()
+                    
+                    if literal and literal not in content_lower:
+                        return None
+                    
+                    # Patterns match within a single line, never across one
+                    match_lines = []
+                    lines = zip(content.split('\n'), content_lower.split('\n'))
+                    for i, (line, line_lower) in enumerate(lines, 1):
+                        if literal and literal not in line_lower:
+                            continue
+                        if is_literal or pattern_re.search(line):
+                            match_lines.append({
+                                "line_number": i,
+                                "content": line.strip()
+                            })
+                            if len(match_lines) == 5:  # First 5 matches
+                                break
+                    
+                    if match_lines:
+                        return {
                             "file": file_name,
                             "match_type": "content",
                             "pattern": content_pattern,
-                            "match_lines": match_lines[:5]  # First 5 matches
-                        })
+                            "match_lines": match_lines
+                        }
                 except Exception as e:
                     self.logger.debug(f"Could not search in {file_name}: {e}")
+                return None
+            
+            # Limit search to prevent overload
+            content_matches = await self._gather_per_file(list(islice(search_files, 10)), search_file)
+            matches.extend(match for match in content_matches if match is not None)
         
         return {
             "search_directory": search_dir,
@@ -465,40 +600,32 @@ class FileAgent(BaseAgent):
         self.logger.info(f"Batch processing files in {directory}")
         
         # Get files to process
-        listing_result = await self.call_tool("list_directory", {"path": directory})
-        listing = listing_result.content[0].text
-        
-        # Extract file names
-        lines = listing.split('\n')[1:]
-        files = []
-        for line in lines:
-            if line.strip() and line.startswith("file:"):
-                file_name = line.split(": ", 1)[1].split(" (")[0]
-                files.append(file_name)
-        
-        results = []
+        listing_result = await self._cached_list(directory)
+        files = [entry["name"] for entry in _parse_tool_json(listing_result)["files"]]
+        prefix = _path_prefix(directory)
         
         if operation == "count_lines":
-            total_lines = 0
-            for file_name in files:
+            async def count_lines(file_name: str) -> Dict[str, Any]:
                 try:
-                    file_path = f"{directory}/{file_name}" if directory != "." else file_name
-                    content_result = await self.call_tool("read_file", {"path": file_path})
-                    content = content_result.content[0].text
-                    line_count = len(content.split('\n'))
-                    total_lines += line_count
+                    file_path = prefix + file_name
+                    # Counted server-side so file contents never cross the stdio pipe
+                    count_result = await self.call_tool("count_lines", {"path": file_path})
+                    counted = _parse_tool_json(count_result)
                     
-                    results.append({
+                    return {
                         "file": file_name,
-                        "lines": line_count,
+                        "lines": counted["lines"],
                         "status": "success"
-                    })
+                    }
                 except Exception as e:
-                    results.append({
+                    return {
                         "file": file_name,
                         "error": str(e),
                         "status": "error"
-                    })
+                    }
+            
+            results = await self._gather_per_file(files, count_lines)
+            total_lines = sum(r.get("lines", 0) for r in results)
             
             return {
                 "operation": operation,
@@ -509,35 +636,26 @@ class FileAgent(BaseAgent):
             }
         
         elif operation == "get_file_sizes":
-            total_size = 0
-            for file_name in files:
+            async def get_file_size(file_name: str) -> Dict[str, Any]:
                 try:
-                    file_path = f"{directory}/{file_name}" if directory != "." else file_name
-                    info_result = await self.call_tool("get_file_info", {"path": file_path})
-                    info_text = info_result.content[0].text
-                    
-                    # Extract size from info (simple parsing)
-                    size = 0
-                    for line in info_text.split('\n'):
-                        if 'size:' in line.lower():
-                            try:
-                                size = int(line.split(':')[1].strip())
-                                break
-                            except (ValueError, IndexError):
-                                pass
+                    file_path = prefix + file_name
+                    info_result = await self._cached_info(file_path)
+                    size = _parse_tool_json(info_result)["size"]
                     
-                    total_size += size
-                    results.append({
+                    return {
                         "file": file_name,
                         "size": size,
                         "status": "success"
-                    })
+                    }
                 except Exception as e:
-                    results.append({
+                    return {
                         "file": file_name,
                         "error": str(e),
                         "status": "error"
-                    })
+                    }
+            
+            results = await self._gather_per_file(files, get_file_size)
+            total_size = sum(r.get("size", 0) for r in results)
             
             return {
                 "operation": operation,
@@ -559,45 +677,51 @@ class FileAgent(BaseAgent):
         self.logger.info(f"Organizing files in {source_dir} by {organize_by}")
         
         # Get files to organize
-        listing_result = await self.call_tool("list_directory", {"path": source_dir})
-        listing = listing_result.content[0].text
-        
-        # Extract file names
-        lines = listing.split('\n')[1:]
-        files = []
-        for line in lines:
-            if line.strip() and line.startswith("file:"):
-                file_name = line.split(": ", 1)[1].split(" (")[0]
-                files.append(file_name)
+        listing_result = await self._cached_list(source_dir)
+        listing = _parse_tool_json(listing_result)
+        prefix = _path_prefix(source_dir)
         
         organization_plan = {}
+        total_files = 0
         
         if organize_by == "extension":
-            for file_name in files:
+            # Stream names straight into the plan
+            for kind, file_name, _ in _iter_listing(listing):
+                if kind != "file":
+                    continue
+                total_files += 1
                 ext = Path(file_name).suffix.lower() or "no_extension"
-                if ext not in organization_plan:
-                    organization_plan[ext] = []
-                organization_plan[ext].append(file_name)
+                organization_plan.setdefault(ext, []).append(file_name)
         
         elif organize_by == "size":
+            files = [name for kind, name, _ in _iter_listing(listing) if kind == "file"]
+            total_files = len(files)
+            
             # Get file sizes and categorize
-            for file_name in files:
+            async def categorize(file_name: str) -> str:
                 try:
-                    file_path = f"{source_dir}/{file_name}" if source_dir != "." else file_name
-                    info_result = await self.call_tool("get_file_info", {"path": file_path})
+                    file_path = prefix + file_name
+                    info_result = await self._cached_info(file_path)
                     # Simple size categorization
-                    category = "large"  # Default
-                    organization_plan.setdefault(category, []).append(file_name)
+                    return "large"  # Default
                 except Exception:
-                    organization_plan.setdefault("unknown", []).append(file_name)
+                    return "unknown"
+            
+            categories = await self._gather_per_file(files, categorize)
+            for file_name, category in zip(files, categories):
+                organization_plan.setdefault(category, []).append(file_name)
+        
+        else:
+            total_files = sum(1 for kind, _, _ in _iter_listing(listing) if kind == "file")
         
         # Create directory structure if requested
         directories_created = []
         if create_structure:
             for category in organization_plan.keys():
-                target_dir = f"{source_dir}/{category}"
+                target_dir = prefix + category
                 try:
                     await self.call_tool("create_directory", {"path": target_dir})
+                    self._invalidate_cache(target_dir)
                     directories_created.append(target_dir)
                 except Exception as e:
                     self.logger.debug(f"Could not create directory {target_dir}: {e}")
@@ -607,7 +731,7 @@ class FileAgent(BaseAgent):
             "organize_by": organize_by,
             "organization_plan": organization_plan,
             "directories_created": directories_created,
-            "total_files": len(files),
+            "total_files": total_files,
             "categories": len(organization_plan)
         }
     
@@ -626,64 +750,71 @@ class FileAgent(BaseAgent):
         # Create backup directory
         try:
             await self.call_tool("create_directory", {"path": backup_directory})
+            self._invalidate_cache(backup_directory)
         except Exception:
             pass  # Directory might already exist
         
-        backup_results = []
-        
         # If backing up directory, get file list
         if source_directory:
-            listing_result = await self.call_tool("list_directory", {"path": source_directory})
-            listing = listing_result.content[0].text
+            listing_result = await self._cached_list(source_directory)
+            prefix = _path_prefix(source_directory)
+            source_files.extend(prefix + entry["name"] for entry in _parse_tool_json(listing_result)["files"])
+        
+        backup_prefix = _path_prefix(backup_directory)
+        
+        # One timestamp for the whole batch so its backups sort together
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S") if include_timestamp else None
+        
+        # Create backup filename
+        def backup_path_for(source_file: str) -> str:
+            file_name = Path(source_file).name
+            if timestamp:
+                name_parts = file_name.rsplit('.', 1)
+                if len(name_parts) == 2:
+                    backup_name = f"{name_parts[0]}_{timestamp}.{name_parts[1]}"
+                else:
+                    backup_name = f"{file_name}_{timestamp}"
+            else:
+                backup_name = file_name
             
-            lines = listing.split('\n')[1:]
-            for line in lines:
-                if line.strip() and line.startswith("file:"):
-                    file_name = line.split(": ", 1)[1].split(" (")[0]
-                    source_files.append(f"{source_directory}/{file_name}")
-        
-        # Backup each file
-        for source_file in source_files:
+            return backup_prefix + backup_name
+        
+        # Copy server-side, many files per request, so neither file contents
+        # nor one round trip per file cross the stdio pipe
+        async def backup_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+            backup_paths = [backup_path_for(source_file) for source_file in chunk]
             try:
-                # Read source file
-                content_result = await self.call_tool("read_file", {"path": source_file})
-                content = content_result.content[0].text
-                
-                # Create backup filename
-                file_name = Path(source_file).name
-                if include_timestamp:
-                    from datetime import datetime
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    name_parts = file_name.rsplit('.', 1)
-                    if len(name_parts) == 2:
-                        backup_name = f"{name_parts[0]}_{timestamp}.{name_parts[1]}"
-                    else:
-                        backup_name = f"{file_name}_{timestamp}"
-                else:
-                    backup_name = file_name
-                
-                backup_path = f"{backup_directory}/{backup_name}"
-                
-                # Write backup
-                await self.call_tool("write_file", {
-                    "path": backup_path,
-                    "content": content
-                })
-                
-                backup_results.append({
-                    "source": source_file,
-                    "backup": backup_path,
-                    "status": "success",
-                    "size": len(content)
-                })
-                
+                copies = await self.call_tools_batch([
+                    {"tool": "copy_file", "arguments": {"source": source_file, "destination": backup_path}}
+                    for source_file, backup_path in zip(chunk, backup_paths)
+                ])
             except Exception as e:
-                backup_results.append({
-                    "source": source_file,
-                    "error": str(e),
-                    "status": "error"
-                })
+                return [
+                    {"source": source_file, "error": str(e), "status": "error"}
+                    for source_file in chunk
+                ]
+            
+            results = []
+            for source_file, backup_path, copy in zip(chunk, backup_paths, copies):
+                if copy["status"] == "success":
+                    self._invalidate_cache(backup_path)
+                    results.append({
+                        "source": source_file,
+                        "backup": backup_path,
+                        "status": "success",
+                        "size": _parse_json_text(copy["text"])["size"]
+                    })
+                else:
+                    results.append({
+                        "source": source_file,
+                        "error": copy["error"],
+                        "status": "error"
+                    })
+            return results
         
+        chunks = [source_files[i:i + TOOL_BATCH_SIZE] for i in range(0, len(source_files), TOOL_BATCH_SIZE)]
+        chunk_results = await self._gather_per_file(chunks, backup_chunk)
+        backup_results = [result for results in chunk_results for result in results]
         successful_backups = len([r for r in backup_results if r["status"] == "success"])
         
         return {
@@ -694,18 +825,94 @@ class FileAgent(BaseAgent):
             "backup_results": backup_results
         }
     
+    async def _cached_list(self, path: str, include_hidden: bool = False,
+                           ttl: float = METADATA_CACHE_TTL) -> Any:
+        """Call list_directory, reusing a result fetched less than ``ttl`` seconds ago."""
+        key = (str(Path(path)), include_hidden)
+        return await self._cached_call(self._dir_cache, key, ttl, "list_directory", {
+            "path": path,
+            "include_hidden": include_hidden
+        })
+    
+    async def _cached_info(self, path: str, ttl: float = METADATA_CACHE_TTL) -> Any:
+        """Call get_file_info, reusing a result fetched less than ``ttl`` seconds ago."""
+        return await self._cached_call(self._info_cache, str(Path(path)), ttl, "get_file_info", {
+            "path": path
+        })
+    
+    async def _cached_call(self, cache: OrderedDict, key: Any, ttl: float,
+                           tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Serve a metadata tool call from ``cache`` or fetch and store it."""
+        entry = cache.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < ttl:
+            cache.move_to_end(key)
+            return entry[1]
+        
+        result = await self.call_tool(tool_name, arguments)
+        # Errors may be transient, so they are never replayed from the cache
+        if not result.isError:
+            cache[key] = (now, result)
+            cache.move_to_end(key)
+            if len(cache) > MAX_METADATA_CACHE_SIZE:
+                cache.popitem(last=False)
+        return result
+    
+    def _invalidate_cache(self, path: str) -> None:
+        """
+        Drop cached metadata affected by a change to ``path``.
+        
+        Covers the path itself, anything beneath it, and the listing of its
+        parent directory.
+        """
+        changed = str(Path(path))
+        parent = str(Path(path).parent)
+        prefix = changed.rstrip("/") + "/"
+        
+        def affected(cached_path: str) -> bool:
+            return cached_path in (changed, parent) or cached_path.startswith(prefix)
+        
+        for key in [k for k in self._dir_cache if affected(k[0])]:
+            del self._dir_cache[key]
+        for key in [k for k in self._info_cache if affected(k)]:
+            del self._info_cache[key]
+    
+    async def _gather_per_file(self, items: List[Any],
+                               worker: Callable[[Any], Awaitable[Any]]) -> List[Any]:
+        """
+        Run a per-file coroutine over ``items`` concurrently.
+        
+        Concurrency is capped at the agent's ``max_concurrent_tasks`` so batch
+        handlers do not flood the file operations server. Workers are
+        expected to handle their own errors.
+        
+        Args:
+            items: Items to process, usually file names or paths
+            worker: Coroutine function called once per item
+            
+        Returns:
+            Worker results in the same order as ``items``
+        """
+        semaphore = asyncio.Semaphore(self.registration.max_concurrent_tasks)
+        
+        async def run(item: Any) -> Any:
+            async with semaphore:
+                return await worker(item)
+        
+        return await asyncio.gather(*(run(item) for item in items))
+    
     def _get_tools_used_in_task(self, task: Task) -> List[str]:
         """Return tools used for specific task types."""
         tool_mapping = {
-            "read_file": ["read_file", "get_file_info"],
+            "read_file": ["read_file"],
             "write_file": ["write_file", "create_directory"],
-            "list_directory": ["list_directory"],
+            "list_directory": ["list_directory", "list_tree"],
             "create_directory": ["create_directory"],
             "delete_file": ["delete_file"],
-            "analyze_directory": ["list_directory", "read_file", "get_file_info"],
+            "analyze_directory": ["list_directory", "list_tree", "read_file"],
             "search_files": ["list_directory", "read_file"],
-            "batch_process_files": ["list_directory", "read_file", "get_file_info"],
+            "batch_process_files": ["list_directory", "count_lines", "get_file_info"],
             "organize_files": ["list_directory", "get_file_info", "create_directory"],
-            "backup_files": ["read_file", "write_file", "create_directory"]
+            "backup_files": ["batch_call", "copy_file", "create_directory"]
         }
         return tool_mapping.get(task.type, [])
\ No newline at end of file
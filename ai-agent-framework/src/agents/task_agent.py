@@ -7,9 +7,15 @@ This agent connects to the task management MCP server and provides
 intelligent task handling capabilities.
 """
 
+import asyncio
+import json
+import re
 import sys
+import time
+import uuid
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 # Add the project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
@@ -20,6 +26,98 @@ from src.core.types import (
 )
 
 
+# Seconds a read-only task query result stays fresh
+QUERY_CACHE_TTL = 2.0
+
+# Query results kept before the least recently used is evicted
+MAX_QUERY_CACHE_SIZE = 128
+
+# Tools that only read task state, and so may be served from the cache
+_CACHEABLE_TOOLS = frozenset({"list_tasks", "get_agent_workload", "get_task_history", "get_task_counts"})
+
+# schedule_tasks strategy -> list_tasks order_by
+_SCHEDULING_ORDERS = {
+    "priority_first": "priority_desc",
+    "fifo": "created_at_asc",
+    "deadline_first": "deadline_asc"
+}
+
+# Header of a list_tasks response, e.g. "Found 3 tasks:"
+_COUNT_RE = re.compile(r"Found (\d+) tasks")
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str, opener: str = "{") -> Any:
+    """
+    Decode the JSON value that follows a tool response's prose header.
+    
+    Decoding starts at the first ``opener`` and works on the text in place,
+    without copying its tail.
+    
+    Returns:
+        The decoded value, or None if ``opener`` does not occur in the text
+    """
+    start = text.find(opener)
+    if start == -1:
+        return None
+    return _JSON_DECODER.raw_decode(text, start)[0]
+
+
+def _parse_task_count(text: str) -> int:
+    """Read the task count from a list_tasks response header, or 0 if absent."""
+    match = _COUNT_RE.match(text)
+    return int(match.group(1)) if match else 0
+
+
+def _step_arguments(step: Dict[str, Any], task_id: str, dependencies: List[str]) -> Dict[str, Any]:
+    """Build the create_task arguments for a workflow step."""
+    return {
+        "task_id": task_id,
+        "type": step.get("type"),
+        "description": step.get("description"),
+        "parameters": step.get("parameters", {}),
+        "priority": step.get("priority", 5),
+        "dependencies": dependencies
+    }
+
+
+def _dependency_batches(tasks: List[Dict[str, Any]]) -> Tuple[List[List[str]], List[str]]:
+    """
+    Group tasks into batches that can run concurrently, in dependency order.
+    
+    Every task in a batch depends only on tasks in earlier batches, so each
+    batch can be started as a whole once the previous one finishes.
+    Dependencies on tasks outside ``tasks`` are treated as already met.
+    
+    Returns:
+        The batches of task IDs, and the IDs of tasks left on a dependency
+        cycle that can never become ready
+    """
+    indegree = {t["id"]: 0 for t in tasks}
+    children: Dict[str, List[str]] = {task_id: [] for task_id in indegree}
+    for t in tasks:
+        for dependency in t.get("dependencies", []):
+            if dependency in indegree:
+                indegree[t["id"]] += 1
+                children[dependency].append(t["id"])
+    
+    batches = []
+    ready = deque(task_id for task_id, degree in indegree.items() if degree == 0)
+    while ready:
+        batch = list(ready)
+        ready.clear()
+        for task_id in batch:
+            for child in children[task_id]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        batches.append(batch)
+    
+    blocked = [task_id for task_id, degree in indegree.items() if degree > 0]
+    return batches, blocked
+
+
 class TaskAgent(BaseAgent):
     """
     Specialized agent for task management and workflow coordination.
@@ -69,6 +167,21 @@ class TaskAgent(BaseAgent):
         # Task management state
         self._active_workflows: Dict[str, Dict[str, Any]] = {}
         self._agent_registry: Dict[str, Dict[str, Any]] = {}
+        
+        # (tool name, arguments) -> (fetched at, result) for read-only queries
+        self._query_cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        
+        # Task type -> handler
+        self._task_handlers = {
+            "create_task": self._handle_create_task,
+            "manage_workflow": self._handle_manage_workflow,
+            "schedule_tasks": self._handle_schedule_tasks,
+            "monitor_progress": self._handle_monitor_progress,
+            "balance_workload": self._handle_balance_workload,
+            "analyze_performance": self._handle_analyze_performance,
+            "coordinate_dependencies": self._handle_coordinate_dependencies,
+            "generate_reports": self._handle_generate_reports
+        }
     
     async def setup(self) -> bool:
         """Setup the task agent by connecting to required servers."""
@@ -81,7 +194,8 @@ class TaskAgent(BaseAgent):
                 args=["src/servers/task_management_server.py"],
                 tools=[
                     "create_task", "get_task", "update_task_status", "list_tasks",
-                    "get_next_task", "register_agent", "get_task_history", "get_agent_workload"
+                    "get_next_task", "register_agent", "get_task_history", "get_agent_workload",
+                    "get_task_counts"
                 ],
                 resources=["task_queue", "task_history", "agent_registry"]
             )
@@ -92,10 +206,11 @@ class TaskAgent(BaseAgent):
                 return False
             
             # Register self with task management system
+            registration = self.registration
             await self.call_tool("register_agent", {
                 "name": self.name,
-                "capabilities": self.registration.capabilities,
-                "max_concurrent_tasks": self.registration.max_concurrent_tasks
+                "capabilities": registration.capabilities,
+                "max_concurrent_tasks": registration.max_concurrent_tasks
             })
             
             await self.start()
@@ -108,29 +223,37 @@ class TaskAgent(BaseAgent):
     
     def _can_handle_task_specific(self, task: Task) -> bool:
         """Check if this agent can handle the specific task."""
-        return task.type in self.registration.supported_task_types
+        return task.type in self._supported_types
     
     async def _execute_task_specific(self, task: Task, context: Optional[Context]) -> Dict[str, Any]:
         """Execute task-specific operations."""
-        
-        if task.type == "create_task":
-            return await self._handle_create_task(task)
-        elif task.type == "manage_workflow":
-            return await self._handle_manage_workflow(task)
-        elif task.type == "schedule_tasks":
-            return await self._handle_schedule_tasks(task)
-        elif task.type == "monitor_progress":
-            return await self._handle_monitor_progress(task)
-        elif task.type == "balance_workload":
-            return await self._handle_balance_workload(task)
-        elif task.type == "analyze_performance":
-            return await self._handle_analyze_performance(task)
-        elif task.type == "coordinate_dependencies":
-            return await self._handle_coordinate_dependencies(task)
-        elif task.type == "generate_reports":
-            return await self._handle_generate_reports(task)
-        else:
+        handler = self._task_handlers.get(task.type)
+        if handler is None:
             raise ValueError(f"Unsupported task type: {task.type}")
+        return await handler(task)
+    
+    async def _get_status_counts(self, statuses: List[str]) -> Dict[str, int]:
+        """
+        Count tasks in each of the given statuses.
+        
+        Uses the server's ``get_task_counts`` tool, which answers from a single
+        query. Servers without it are asked for a count-only ``list_tasks``
+        per status, concurrently.
+        """
+        if "get_task_counts" in self._available_tools:
+            result = await self._cached_call("get_task_counts", {})
+            counts = _extract_json(result.content[0].text)
+            return {status: counts.get(status, 0) for status in statuses}
+        
+        results = await asyncio.gather(*[
+            self._cached_call("list_tasks", {"status": status, "count_only": True})
+            for status in statuses
+        ])
+        
+        return {
+            status: _parse_task_count(result.content[0].text)
+            for status, result in zip(statuses, results)
+        }
     
     async def _handle_create_task(self, task: Task) -> Dict[str, Any]:
         """Create a new task in the system."""
@@ -158,18 +281,13 @@ class TaskAgent(BaseAgent):
             "assigned_agent": assigned_agent
         })
         
+        self._query_cache.clear()
+        
         # Parse the result to extract task ID
         result_text = result.content[0].text
-        import json
         try:
-            # Extract JSON from the result text
-            json_start = result_text.find('{')
-            if json_start != -1:
-                json_text = result_text[json_start:]
-                task_info = json.loads(json_text)
-                task_id = task_info.get("task_id")
-            else:
-                task_id = "unknown"
+            task_info = _extract_json(result_text)
+            task_id = task_info.get("task_id") if task_info is not None else "unknown"
         except Exception:
             task_id = "unknown"
         
@@ -193,67 +311,87 @@ class TaskAgent(BaseAgent):
         
         self.logger.info(f"Managing workflow: {workflow_id} with {len(workflow_steps)} steps")
         
-        # Store workflow state
+        # Store workflow state; finished task IDs are kept in sets so
+        # recording and checking an outcome is O(1)
         self._active_workflows[workflow_id] = {
             "steps": workflow_steps,
             "execution_mode": execution_mode,
             "status": "planning",
             "created_tasks": [],
-            "completed_tasks": [],
-            "failed_tasks": []
+            "completed_tasks": set(),
+            "failed_tasks": set()
         }
         
-        created_tasks = []
+        # Task IDs are chosen here so each step can name the steps it depends
+        # on without waiting for the server to assign IDs
+        step_ids = [str(uuid.uuid4())[:8] for _ in workflow_steps]
         
         if execution_mode == "sequential":
-            # Create tasks with dependencies
-            prev_task_id = None
-            for i, step in enumerate(workflow_steps):
-                dependencies = [prev_task_id] if prev_task_id else []
-                
-                create_result = await self.call_tool("create_task", {
-                    "type": step.get("type"),
-                    "description": step.get("description"),
-                    "parameters": step.get("parameters", {}),
-                    "priority": step.get("priority", 5),
-                    "dependencies": dependencies
-                })
-                
-                # Extract task ID from result
-                result_text = create_result.content[0].text
-                try:
-                    import json
-                    json_start = result_text.find('{')
-                    if json_start != -1:
-                        task_info = json.loads(result_text[json_start:])
-                        task_id = task_info.get("task_id")
-                        created_tasks.append(task_id)
-                        prev_task_id = task_id
-                except Exception:
-                    self.logger.warning(f"Could not extract task ID from step {i}")
-        
+            # Chain each step onto the one before it
+            dependencies = [[]] + [[task_id] for task_id in step_ids[:-1]]
         elif execution_mode == "parallel":
             # Create all tasks without dependencies
+            dependencies = [[] for _ in workflow_steps]
+        elif execution_mode == "dag":
+            # Each step lists the indices of the steps it depends on
+            step_range = range(len(workflow_steps))
+            dependencies = []
             for step in workflow_steps:
-                create_result = await self.call_tool("create_task", {
-                    "type": step.get("type"),
-                    "description": step.get("description"),
-                    "parameters": step.get("parameters", {}),
-                    "priority": step.get("priority", 5),
-                    "dependencies": []
-                })
-                
-                # Extract task ID
-                result_text = create_result.content[0].text
-                try:
-                    import json
-                    json_start = result_text.find('{')
-                    if json_start != -1:
-                        task_info = json.loads(result_text[json_start:])
-                        task_id = task_info.get("task_id")
-                        created_tasks.append(task_id)
-                except Exception:
-                    continue
+                indices = step.get("dependencies", [])
+                if not all(isinstance(i, int) and i in step_range for i in indices):
+                    raise ValueError(f"Step dependencies must be indices of workflow steps: {indices}")
+                dependencies.append([step_ids[i] for i in indices])
+        else:
+            step_ids = []
+            dependencies = []
+        
+        step_index = {task_id: i for i, task_id in enumerate(step_ids)}
+        
+        if execution_mode == "dag":
+            # Create the graph one level at a time so every dependency exists
+            # before the steps that need it are submitted
+            batches, blocked = _dependency_batches([
+                {"id": task_id, "dependencies": step_dependencies}
+                for task_id, step_dependencies in zip(step_ids, dependencies)
+            ])
+            if blocked:
+                cycle = sorted(step_index[task_id] for task_id in blocked)
+                raise ValueError(f"Workflow steps form a dependency cycle: {cycle}")
+            levels = [[step_index[task_id] for task_id in batch] for batch in batches]
+        elif execution_mode == "sequential":
+            # Each step is its own level: the server only accepts a step once
+            # its predecessor exists, and a failed step skips those after it
+            levels = [[i] for i in range(len(step_ids))]
+        else:
+            levels = [list(range(len(step_ids)))]
+        
+        created = set()
+        skipped = set()
+        
+        for level in levels:
+            # Steps whose dependencies could not be created would be rejected
+            submit = []
+            for i in level:
+                if any(dependency in skipped for dependency in dependencies[i]):
+                    self.logger.warning(f"Skipping step {i}: a step it depends on was not created")
+                    skipped.add(step_ids[i])
+                else:
+                    submit.append(i)
+            
+            results = await asyncio.gather(*[
+                self.call_tool("create_task", _step_arguments(workflow_steps[i], step_ids[i], dependencies[i]))
+                for i in submit
+            ])
+            
+            for i, result in zip(submit, results):
+                if result.isError:
+                    self.logger.warning(f"Could not create task for step {i}: {result.content[0].text}")
+                    skipped.add(step_ids[i])
+                else:
+                    created.add(step_ids[i])
+        
+        self._query_cache.clear()
+        created_tasks = [task_id for task_id in step_ids if task_id in created]
         
         # Update workflow state
         self._active_workflows[workflow_id]["created_tasks"] = created_tasks
@@ -275,48 +413,35 @@ class TaskAgent(BaseAgent):
         
         self.logger.info(f"Scheduling tasks using {scheduling_strategy} strategy")
         
-        # Get pending tasks
-        result = await self.call_tool("list_tasks", {
-            "status": "pending",
-            "limit": 100
-        })
-        
-        # Parse tasks from result
-        result_text = result.content[0].text
-        tasks_data = []
-        
-        try:
-            import json
-            # Extract JSON array from result
-            json_start = result_text.find('[')
-            if json_start != -1:
-                json_text = result_text[json_start:]
-                tasks_data = json.loads(json_text)
-        except Exception:
-            self.logger.warning("Could not parse tasks from result")
-        
-        # Apply scheduling strategy
+        # The server orders pending tasks by the strategy and returns only
+        # the ones that will be scheduled
+        order_by = _SCHEDULING_ORDERS.get(scheduling_strategy)
         scheduled_tasks = []
         
-        if scheduling_strategy == "priority_first":
-            # Sort by priority (highest first)
-            sorted_tasks = sorted(tasks_data, key=lambda t: t.get("priority", 5), reverse=True)
-            scheduled_tasks = sorted_tasks[:max_concurrent]
-        
-        elif scheduling_strategy == "fifo":
-            # First In, First Out
-            sorted_tasks = sorted(tasks_data, key=lambda t: t.get("created_at", ""))
-            scheduled_tasks = sorted_tasks[:max_concurrent]
-        
-        elif scheduling_strategy == "deadline_first":
-            # Sort by deadline (earliest first)
-            deadline_tasks = [t for t in tasks_data if t.get("deadline")]
-            sorted_tasks = sorted(deadline_tasks, key=lambda t: t.get("deadline", ""))
-            scheduled_tasks = sorted_tasks[:max_concurrent]
+        if order_by is not None:
+            result, pending_counts = await asyncio.gather(
+                self._cached_call("list_tasks", {
+                    "status": "pending",
+                    "order_by": order_by,
+                    "limit": max_concurrent
+                }),
+                self._get_status_counts(["pending"])
+            )
+            
+            try:
+                scheduled_tasks = _extract_json(result.content[0].text, "[") or []
+            except Exception:
+                self.logger.warning("Could not parse tasks from result")
+            
+            if scheduling_strategy == "deadline_first":
+                # Tasks without a deadline sort last; leave them out
+                scheduled_tasks = [t for t in scheduled_tasks if t.get("deadline")]
+        else:
+            pending_counts = await self._get_status_counts(["pending"])
         
         return {
             "scheduling_strategy": scheduling_strategy,
-            "total_pending_tasks": len(tasks_data),
+            "total_pending_tasks": pending_counts["pending"],
             "scheduled_tasks": len(scheduled_tasks),
             "max_concurrent": max_concurrent,
             "scheduled_task_ids": [t.get("id") for t in scheduled_tasks]
@@ -333,22 +458,7 @@ class TaskAgent(BaseAgent):
         
         if monitor_target == "all":
             # Get overall system progress
-            for status in ["pending", "running", "completed", "failed"]:
-                result = await self.call_tool("list_tasks", {
-                    "status": status,
-                    "limit": 1000
-                })
-                
-                # Count tasks in this status
-                result_text = result.content[0].text
-                if "Found" in result_text:
-                    try:
-                        count = int(result_text.split("Found ")[1].split(" tasks")[0])
-                        progress_data[status] = count
-                    except Exception:
-                        progress_data[status] = 0
-                else:
-                    progress_data[status] = 0
+            progress_data = await self._get_status_counts(["pending", "running", "completed", "failed"])
         
         elif monitor_target == "workflow" and target_id:
             # Monitor specific workflow
@@ -364,16 +474,14 @@ class TaskAgent(BaseAgent):
         
         elif monitor_target == "agent" and target_id:
             # Monitor specific agent workload
-            result = await self.call_tool("get_agent_workload", {
+            result = await self._cached_call("get_agent_workload", {
                 "agent_name": target_id
             })
             
             result_text = result.content[0].text
             try:
-                import json
-                json_start = result_text.find('{')
-                if json_start != -1:
-                    agent_data = json.loads(result_text[json_start:])
+                agent_data = _extract_json(result_text)
+                if agent_data is not None:
                     progress_data = agent_data
             except Exception:
                 progress_data = {"error": "Could not parse agent data"}
@@ -392,32 +500,26 @@ class TaskAgent(BaseAgent):
         
         self.logger.info(f"Balancing workload using {rebalance_strategy} strategy")
         
-        # Get current agent workloads
-        workload_result = await self.call_tool("get_agent_workload", {})
-        workload_text = workload_result.content[0].text
+        # Get current agent workloads and pending tasks concurrently
+        workload_result, pending_result = await asyncio.gather(
+            self._cached_call("get_agent_workload", {}),
+            self._cached_call("list_tasks", {
+                "status": "pending",
+                "limit": 100
+            })
+        )
         
+        workload_text = workload_result.content[0].text
         agents_data = []
         try:
-            import json
-            json_start = workload_text.find('[')
-            if json_start != -1:
-                agents_data = json.loads(workload_text[json_start:])
+            agents_data = _extract_json(workload_text, "[") or []
         except Exception:
             self.logger.warning("Could not parse agent workload data")
         
-        # Get pending tasks
-        pending_result = await self.call_tool("list_tasks", {
-            "status": "pending",
-            "limit": 100
-        })
-        
         pending_text = pending_result.content[0].text
         pending_tasks = []
         try:
-            import json
-            json_start = pending_text.find('[')
-            if json_start != -1:
-                pending_tasks = json.loads(pending_text[json_start:])
+            pending_tasks = _extract_json(pending_text, "[") or []
         except Exception:
             pass
         
@@ -432,27 +534,24 @@ class TaskAgent(BaseAgent):
                 "total_pending_tasks": total_tasks
             }
         
-        # Simple even distribution strategy
+        # Simple even distribution strategy: the first total_tasks % total_agents
+        # agents take one extra task, so loads differ by at most one
+        assignments = {}
         if rebalance_strategy == "even_distribution":
-            tasks_per_agent = total_tasks // total_agents
-            assignments = {}
+            task_ids = [t.get("id") for t in pending_tasks]
+            per_agent, extra = divmod(total_tasks, total_agents)
+            bounds = [i * per_agent + min(i, extra) for i in range(total_agents + 1)]
             
             for i, agent in enumerate(agents_data):
                 agent_name = agent.get("name")
                 if agent_name:
-                    start_idx = i * tasks_per_agent
-                    end_idx = start_idx + tasks_per_agent
-                    if i == total_agents - 1:  # Last agent gets remaining tasks
-                        end_idx = total_tasks
-                    
-                    assigned_tasks = pending_tasks[start_idx:end_idx]
-                    assignments[agent_name] = [t.get("id") for t in assigned_tasks]
+                    assignments[agent_name] = task_ids[bounds[i]:bounds[i + 1]]
         
         return {
             "strategy": rebalance_strategy,
             "total_agents": total_agents,
             "total_pending_tasks": total_tasks,
-            "assignments": assignments if 'assignments' in locals() else {},
+            "assignments": assignments,
             "status": "completed"
         }
     
@@ -463,36 +562,10 @@ class TaskAgent(BaseAgent):
         
         self.logger.info(f"Analyzing performance for period: {analysis_period}")
         
-        # Get completed tasks for analysis
-        completed_result = await self.call_tool("list_tasks", {
-            "status": "completed",
-            "limit": 1000
-        })
-        
-        failed_result = await self.call_tool("list_tasks", {
-            "status": "failed",
-            "limit": 1000
-        })
-        
-        # Parse results
-        completed_text = completed_result.content[0].text
-        failed_text = failed_result.content[0].text
-        
-        completed_count = 0
-        failed_count = 0
-        
-        # Extract counts from results
-        if "Found" in completed_text:
-            try:
-                completed_count = int(completed_text.split("Found ")[1].split(" tasks")[0])
-            except Exception:
-                pass
-        
-        if "Found" in failed_text:
-            try:
-                failed_count = int(failed_text.split("Found ")[1].split(" tasks")[0])
-            except Exception:
-                pass
+        # Get completed and failed task counts for analysis
+        counts = await self._get_status_counts(["completed", "failed"])
+        completed_count = counts["completed"]
+        failed_count = counts["failed"]
         
         # Calculate metrics
         total_tasks = completed_count + failed_count
@@ -530,22 +603,29 @@ class TaskAgent(BaseAgent):
         self.logger.info("Coordinating task dependencies")
         
         # Get all pending tasks to check dependencies
-        pending_result = await self.call_tool("list_tasks", {
+        pending_result = await self._cached_call("list_tasks", {
             "status": "pending",
             "limit": 1000
         })
         
-        # For this example, we'll return a summary of dependency coordination
-        # In a real implementation, this would involve complex dependency resolution
+        pending_tasks = []
+        try:
+            pending_tasks = _extract_json(pending_result.content[0].text, "[") or []
+        except Exception:
+            self.logger.warning("Could not parse pending tasks")
+        
+        batches, blocked = _dependency_batches(pending_tasks)
         
         return {
             "strategy": dependency_strategy,
             "auto_resolve": auto_resolve,
             "dependency_analysis": {
-                "checked_tasks": "pending_tasks",
-                "conflicts_found": 0,
+                "checked_tasks": len(pending_tasks),
+                "conflicts_found": len(blocked),
                 "resolutions_applied": 0
             },
+            "batches": batches,
+            "blocked_tasks": blocked,
             "status": "completed"
         }
     
@@ -557,34 +637,17 @@ class TaskAgent(BaseAgent):
         
         self.logger.info(f"Generating {report_type} report for {period}")
         
-        # Get data for different statuses
-        status_counts = {}
-        for status in ["pending", "running", "completed", "failed", "cancelled"]:
-            result = await self.call_tool("list_tasks", {
-                "status": status,
-                "limit": 1000
-            })
-            
-            result_text = result.content[0].text
-            if "Found" in result_text:
-                try:
-                    count = int(result_text.split("Found ")[1].split(" tasks")[0])
-                    status_counts[status] = count
-                except Exception:
-                    status_counts[status] = 0
-            else:
-                status_counts[status] = 0
-        
-        # Get agent workload summary
-        workload_result = await self.call_tool("get_agent_workload", {})
+        # Get status counts and the agent workload summary concurrently
+        status_counts, workload_result = await asyncio.gather(
+            self._get_status_counts(["pending", "running", "completed", "failed", "cancelled"]),
+            self._cached_call("get_agent_workload", {})
+        )
         workload_text = workload_result.content[0].text
         
         agent_summary = {}
         try:
-            import json
-            json_start = workload_text.find('[')
-            if json_start != -1:
-                agents_data = json.loads(workload_text[json_start:])
+            agents_data = _extract_json(workload_text, "[")
+            if agents_data is not None:
                 agent_summary = {
                     "total_agents": len(agents_data),
                     "active_agents": len([a for a in agents_data if a.get("status") == "online"])
@@ -592,34 +655,63 @@ class TaskAgent(BaseAgent):
         except Exception:
             agent_summary = {"total_agents": 0, "active_agents": 0}
         
+        total_tasks = sum(status_counts.values())
+        
         report_data = {
             "report_type": report_type,
             "period": period,
             "generated_at": task.created_at.isoformat() if hasattr(task, 'created_at') else None,
             "task_summary": status_counts,
             "agent_summary": agent_summary,
-            "total_tasks": sum(status_counts.values())
+            "total_tasks": total_tasks
         }
         
         if include_details:
             report_data["details"] = {
-                "completion_rate": status_counts["completed"] / sum(status_counts.values()) if sum(status_counts.values()) > 0 else 0,
-                "error_rate": status_counts["failed"] / sum(status_counts.values()) if sum(status_counts.values()) > 0 else 0,
+                "completion_rate": status_counts["completed"] / total_tasks if total_tasks > 0 else 0,
+                "error_rate": status_counts["failed"] / total_tasks if total_tasks > 0 else 0,
                 "active_workflows": len(self._active_workflows)
             }
         
         return report_data
     
+    async def _cached_call(self, tool_name: str, arguments: Dict[str, Any],
+                           ttl: float = QUERY_CACHE_TTL) -> Any:
+        """
+        Call a read-only task tool, reusing a result fetched less than ``ttl`` seconds ago.
+        
+        Handlers running close together, such as a progress check followed by
+        a report, share one round trip per distinct query. Creating tasks
+        through this agent clears the cache.
+        """
+        if tool_name not in _CACHEABLE_TOOLS:
+            return await self.call_tool(tool_name, arguments)
+        
+        key = (tool_name, tuple(sorted(arguments.items())))
+        entry = self._query_cache.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < ttl:
+            self._query_cache.move_to_end(key)
+            return entry[1]
+        
+        result = await self.call_tool(tool_name, arguments)
+        if not result.isError:
+            self._query_cache[key] = (now, result)
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > MAX_QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return result
+    
     def _get_tools_used_in_task(self, task: Task) -> List[str]:
         """Return tools used for specific task types."""
         tool_mapping = {
             "create_task": ["create_task"],
             "manage_workflow": ["create_task", "list_tasks"],
             "schedule_tasks": ["list_tasks"],
-            "monitor_progress": ["list_tasks", "get_agent_workload"],
+            "monitor_progress": ["get_task_counts", "get_agent_workload"],
             "balance_workload": ["get_agent_workload", "list_tasks"],
-            "analyze_performance": ["list_tasks"],
+            "analyze_performance": ["get_task_counts"],
             "coordinate_dependencies": ["list_tasks"],
-            "generate_reports": ["list_tasks", "get_agent_workload"]
+            "generate_reports": ["get_task_counts", "get_agent_workload"]
         }
         return tool_mapping.get(task.type, [])
\ No newline at end of file
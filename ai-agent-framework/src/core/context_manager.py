@@ -7,15 +7,147 @@ This demonstrates how to build context-aware systems where agents can share info
 maintain conversation state, and coordinate through shared memory.
 """
 
-import json
+import base64
+import heapq
 import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
 import uuid
+import zlib
+from contextlib import contextmanager
+from collections import OrderedDict, defaultdict
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, DefaultDict, Iterator, List, Optional, Any, Set
 from pathlib import Path
 
+import orjson
+
 from .types import Context, Task, AgentInfo
 
+# Quiet period after a context's last change before it is written
+PERSIST_DEBOUNCE_INTERVAL = 0.02
+# Longest a context waits for its write while changes keep arriving
+PERSIST_FLUSH_INTERVAL = 0.05
+# Wait before retrying a snapshot whose write failed
+PERSIST_RETRY_INTERVAL = 1.0
+# Rewrite the snapshot once a context's op log outgrows it by this factor
+LOG_COMPACTION_RATIO = 4
+# Shared-memory strings/bytes longer than this are stored compressed
+COMPRESSION_THRESHOLD = 4096
+# Match json.dumps, which coerces non-string keys instead of rejecting them
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+# History entries whose adjacent repeats compaction collapses
+_TOOL_MESSAGE_TYPES = {"tool_call", "tool_use", "tool_result"}
+# Characters set aside for the "... [truncated N chars]" marker
+_TRUNCATION_MARKER_RESERVE = 40
+
+
+class _CompressedValue:
+    """A large shared-memory value held zlib-compressed."""
+    
+    __slots__ = ("data", "is_text")
+    
+    def __init__(self, data: bytes, is_text: bool):
+        self.data = data
+        self.is_text = is_text
+    
+    @classmethod
+    def wrap(cls, value: Any) -> Any:
+        """Compress value if it is large text or bytes, else return it unchanged."""
+        if not isinstance(value, (str, bytes)) or len(value) <= COMPRESSION_THRESHOLD:
+            return value
+        
+        is_text = isinstance(value, str)
+        raw = value.encode("utf-8") if is_text else value
+        data = zlib.compress(raw, 3)
+        return cls(data, is_text) if len(data) < len(raw) else value
+    
+    def unwrap(self) -> Any:
+        """Return the original value."""
+        raw = zlib.decompress(self.data)
+        return raw.decode("utf-8") if self.is_text else raw
+    
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Form used when the value is persisted.
+        
+        Persisted compressed values live apart from plain ones (the
+        snapshot's compressed_memory, an op's "z" field), so user data is
+        never mistaken for them.
+        """
+        return {"data": base64.b64encode(self.data).decode("ascii"), "text": self.is_text}
+    
+    @classmethod
+    def from_json(cls, value: Dict[str, Any]) -> "_CompressedValue":
+        """Restore a compressed value persisted by to_json."""
+        return cls(base64.b64decode(value["data"]), value["text"])
+
+
+def _entry_size(key: Any, value: Any) -> int:
+    """Approximate in-memory size of one key/value entry."""
+    if isinstance(value, _CompressedValue):
+        return sys.getsizeof(key) + len(value.data)
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+def _shard(conversation_id: str) -> str:
+    """Two-hex-digit shard directory for a conversation's files."""
+    # Hash rather than take a prefix: ids often share one (e.g. "conv_")
+    return f"{zlib.crc32(conversation_id.encode('utf-8')) & 0xff:02x}"
+
+
+def _is_tool_message(value: Any) -> bool:
+    """Whether value is a tool call or tool result entry in a history list."""
+    return isinstance(value, dict) and value.get("type") in _TOOL_MESSAGE_TYPES
+
+
+def _truncate_tool_result(value: Any, max_chars: int) -> Any:
+    """Return a tool_result dict with oversized text fields cut, else value itself."""
+    if not (isinstance(value, dict) and value.get("type") == "tool_result"):
+        return value
+    
+    oversized = {
+        field: text for field, text in value.items()
+        if field != "type" and isinstance(text, str) and len(text) > max_chars
+    }
+    if not oversized:
+        return value
+    
+    # Leave room for the marker so a truncated field is not cut again
+    keep = max(0, max_chars - _TRUNCATION_MARKER_RESERVE)
+    truncated = dict(value)
+    for field, text in oversized.items():
+        truncated[field] = f"{text[:keep]}... [truncated {len(text) - keep} chars]"
+    return truncated
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write data to a raw file descriptor, resuming after short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_file_atomic(path: Path, data: bytes) -> None:
+    """Write data to path via a synced temp file and an atomic rename."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _write_all(fd, data)
+        os.fdatasync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize anything orjson does not handle natively as a string."""
+    return str(obj)
+
 
 class ContextManager:
     """
@@ -37,12 +169,27 @@ class ContextManager:
         self.storage_path = Path(storage_path) if storage_path else Path("data/contexts")
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
-        # Active contexts
-        self._active_contexts: Dict[str, Context] = {}
-        self._context_indexes: Dict[str, Set[str]] = {
-            "user_id": {},
-            "conversation_id": {},
-            "agent_states": {}
+        # Snapshots live in SQLite (warm tier); recent changes in per-context
+        # JSONL op logs (cold tier) until compaction folds them in
+        self._db_path = self.storage_path / "contexts.db"
+        self._init_database()
+        
+        # Active contexts in least-recently-used order, capped at max_contexts
+        self._active_contexts: OrderedDict[str, Context] = OrderedDict()
+        # Open session count per context; pinned contexts are never evicted,
+        # expired or serialized behind the session's back
+        self._pinned: Dict[str, int] = {}
+        # Last read of each active context; reads never touch updated_at
+        self._last_accessed: Dict[str, datetime] = {}
+        # Running size estimate per active context, adjusted on each change
+        self._memory_sizes: Dict[str, int] = {}
+        # Min-heap of (updated_at, conversation_id); entries are refreshed
+        # lazily when cleanup finds the context was touched since
+        self._expiry_heap: List[tuple] = []
+        self._context_indexes: Dict[str, DefaultDict[str, Set[str]]] = {
+            "user_id": defaultdict(set),
+            "conversation_id": defaultdict(set),
+            "agent_states": defaultdict(set)
         }
         
         # Configuration
@@ -53,7 +200,11 @@ class ContextManager:
             "max_memory_size_mb": 100,
             "enable_persistence": True,
             "enable_context_sharing": True,
-            "memory_compression": True
+            # Large strings/bytes in shared memory are held compressed and
+            # must then be read through get_shared_memory
+            "memory_compression": False,
+            "max_history_items": 100,  # Longest list kept in shared memory
+            "max_tool_result_chars": 16384  # Per text field of a tool_result
         }
         
         # Context statistics
@@ -67,6 +218,46 @@ class ContextManager:
         
         # Last cleanup time
         self._last_cleanup = datetime.now()
+        self._last_cleanup_monotonic = time.monotonic()
+        
+        # Write-behind persistence: mutations mark contexts dirty with a
+        # debounced deadline and a flusher thread writes each one once it
+        # passes, either as a full snapshot or as lines appended to the
+        # context's op log. _lock guards context state against the
+        # flusher; _flush_lock keeps batches in order.
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._dirty_since: Dict[str, float] = {}
+        self._dirty_deadline: Dict[str, float] = {}
+        self._snapshot_due: Set[str] = set()
+        self._pending_ops: Dict[str, List[bytes]] = {}
+        self._snapshot_sizes: Dict[str, int] = {}
+        self._flusher: Optional[threading.Thread] = None
+    
+    def _init_database(self) -> None:
+        """Initialize the context snapshot database."""
+        conn = sqlite3.connect(self._db_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS contexts (
+                conversation_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                blob BLOB NOT NULL
+            )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_contexts_user ON contexts(user_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_contexts_updated ON contexts(updated_at)")
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the context snapshot database."""
+        conn = sqlite3.connect(self._db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
     
     def _setup_logging(self) -> logging.Logger:
         """Setup context manager logging."""
@@ -102,25 +293,31 @@ class ContextManager:
             return self._active_contexts[conversation_id]
         
         # Create new context
+        now = datetime.now()
         context = Context(
             conversation_id=conversation_id,
             user_id=user_id,
             session_data=initial_data or {},
             shared_memory={},
-            active_tasks=[],
+            active_tasks={},
             agent_states={},
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            created_at=now,
+            updated_at=now
         )
         
         # Store context
-        self._active_contexts[conversation_id] = context
-        self._update_indexes(context)
+        with self._lock:
+            self._active_contexts[conversation_id] = context
+            self._memory_sizes[conversation_id] = self._measure_context(context)
+            self._update_indexes(context)
+            heapq.heappush(self._expiry_heap, (context.updated_at, conversation_id))
         
         # Persist if enabled
         if self.config["enable_persistence"]:
             self._persist_context(context)
         
+        self._enforce_context_limit()
+        
         self.stats["contexts_created"] += 1
         self.logger.info(f"Created new context: {conversation_id} for user: {user_id}")
         
@@ -136,18 +333,29 @@ class ContextManager:
         Returns:
             Context if found, None otherwise
         """
+        context = self._lookup_context(conversation_id)
+        if context:
+            self._access_context(context)
+        return context
+    
+    def _lookup_context(self, conversation_id: str) -> Optional[Context]:
+        """Resolve a context, loading it from persistence, without touching it."""
         # Check active contexts first
-        if conversation_id in self._active_contexts:
-            context = self._active_contexts[conversation_id]
-            self._touch_context(context)
+        context = self._active_contexts.get(conversation_id)
+        if context:
+            self._active_contexts.move_to_end(conversation_id)
             return context
         
         # Try loading from persistence
         if self.config["enable_persistence"]:
             context = self._load_context(conversation_id)
             if context:
-                self._active_contexts[conversation_id] = context
-                self._update_indexes(context)
+                with self._lock:
+                    self._active_contexts[conversation_id] = context
+                    self._memory_sizes[conversation_id] = self._measure_context(context)
+                    self._update_indexes(context)
+                    heapq.heappush(self._expiry_heap, (context.updated_at, conversation_id))
+                self._enforce_context_limit()
                 self.stats["contexts_loaded"] += 1
                 self.logger.info(f"Loaded context from persistence: {conversation_id}")
                 return context
@@ -165,33 +373,37 @@ class ContextManager:
         Returns:
             True if successful
         """
-        context = self.get_context(conversation_id)
+        context = self._lookup_context(conversation_id)
         if not context:
             self.logger.warning(f"Context not found for update: {conversation_id}")
             return False
         
-        # Update session data
-        if "session_data" in updates:
-            context.session_data.update(updates["session_data"])
-        
-        # Update shared memory
-        if "shared_memory" in updates:
-            context.shared_memory.update(updates["shared_memory"])
-        
-        # Update agent states
-        if "agent_states" in updates:
-            context.agent_states.update(updates["agent_states"])
-        
-        # Update active tasks
-        if "active_tasks" in updates:
-            new_tasks = updates["active_tasks"]
-            if isinstance(new_tasks, list):
-                context.active_tasks.extend(new_tasks)
-            else:
-                context.active_tasks.append(new_tasks)
-        
-        # Touch context
-        self._touch_context(context)
+        with self._lock:
+            # Update session data
+            if "session_data" in updates:
+                context.session_data.update(updates["session_data"])
+            
+            # Update shared memory
+            if "shared_memory" in updates:
+                context.shared_memory.update(self._encode_memory_values(updates["shared_memory"]))
+            
+            # Update agent states
+            if "agent_states" in updates:
+                context.agent_states.update(updates["agent_states"])
+                self._update_indexes(context)
+            
+            # Update active tasks
+            if "active_tasks" in updates:
+                new_tasks = updates["active_tasks"]
+                if isinstance(new_tasks, list):
+                    context.active_tasks.update((task.id, task) for task in new_tasks)
+                else:
+                    context.active_tasks[new_tasks.id] = new_tasks
+            
+            self._memory_sizes[conversation_id] = self._measure_context(context)
+            
+            # Touch context
+            self._touch_context(context)
         
         # Persist changes
         if self.config["enable_persistence"]:
@@ -212,20 +424,42 @@ class ContextManager:
         Returns:
             True if successful
         """
-        context = self.get_context(conversation_id)
+        context = self._lookup_context(conversation_id)
         if not context:
             return False
         
-        context.shared_memory[key] = value
-        self._touch_context(context)
+        value = self._encode_memory_value(value)
+        
+        with self._lock:
+            size_delta = _entry_size(key, value)
+            if key in context.shared_memory:
+                size_delta -= _entry_size(key, context.shared_memory[key])
+            context.shared_memory[key] = value
+            self._memory_sizes[conversation_id] += size_delta
+            self._touch_context(context)
         
         if self.config["enable_persistence"]:
-            self._persist_context(context)
+            if isinstance(value, _CompressedValue):
+                self._append_op(context, {"op": "set_mem", "k": key, "z": value.to_json()})
+            else:
+                self._append_op(context, {"op": "set_mem", "k": key, "v": value})
         
         self.stats["memory_operations"] += 1
         self.logger.debug(f"Set shared memory {key} in context {conversation_id}")
         return True
     
+    def _encode_memory_value(self, value: Any) -> Any:
+        """Compress a shared-memory value when memory_compression is enabled."""
+        if self.config["memory_compression"]:
+            return _CompressedValue.wrap(value)
+        return value
+    
+    def _encode_memory_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply _encode_memory_value to every value of a shared-memory update."""
+        if not self.config["memory_compression"]:
+            return values
+        return {key: self._encode_memory_value(value) for key, value in values.items()}
+    
     def get_shared_memory(self, conversation_id: str, key: str) -> Any:
         """
         Get a value from shared memory.
@@ -242,6 +476,9 @@ class ContextManager:
             return None
         
         value = context.shared_memory.get(key)
+        if isinstance(value, _CompressedValue):
+            value = value.unwrap()
+        
         self.stats["memory_operations"] += 1
         return value
     
@@ -258,18 +495,25 @@ class ContextManager:
         Returns:
             True if successful
         """
-        context = self.get_context(conversation_id)
+        context = self._lookup_context(conversation_id)
         if not context:
             return False
         
-        if agent_name not in context.agent_states:
-            context.agent_states[agent_name] = {}
-        
-        context.agent_states[agent_name].update(agent_state)
-        self._touch_context(context)
+        with self._lock:
+            state = context.agent_states.get(agent_name)
+            if state is None:
+                size_before = 0
+                state = context.agent_states[agent_name] = {}
+                self._update_indexes(context)
+            else:
+                size_before = _entry_size(agent_name, state)
+            
+            state.update(agent_state)
+            self._memory_sizes[conversation_id] += _entry_size(agent_name, state) - size_before
+            self._touch_context(context)
         
         if self.config["enable_persistence"]:
-            self._persist_context(context)
+            self._append_op(context, {"op": "update_agent", "agent": agent_name, "v": agent_state})
         
         self.logger.debug(f"Updated agent state for {agent_name} in context {conversation_id}")
         return True
@@ -302,17 +546,18 @@ class ContextManager:
         Returns:
             True if successful
         """
-        context = self.get_context(conversation_id)
+        context = self._lookup_context(conversation_id)
         if not context:
             return False
         
         # Add task if not already present
-        if task not in context.active_tasks:
-            context.active_tasks.append(task)
-            self._touch_context(context)
+        if task.id not in context.active_tasks:
+            with self._lock:
+                context.active_tasks[task.id] = task
+                self._touch_context(context)
             
             if self.config["enable_persistence"]:
-                self._persist_context(context)
+                self._append_op(context, {"op": "add_task", "id": task.id})
             
             self.logger.debug(f"Added task {task.id} to context {conversation_id}")
         
@@ -329,20 +574,64 @@ class ContextManager:
         Returns:
             True if successful
         """
-        context = self.get_context(conversation_id)
+        context = self._lookup_context(conversation_id)
         if not context:
             return False
         
         # Remove task
-        context.active_tasks = [t for t in context.active_tasks if t.id != task_id]
-        self._touch_context(context)
+        with self._lock:
+            removed = context.active_tasks.pop(task_id, None)
+            if removed:
+                self._touch_context(context)
         
-        if self.config["enable_persistence"]:
-            self._persist_context(context)
-        
-        self.logger.debug(f"Removed task {task_id} from context {conversation_id}")
+        if removed:
+            if self.config["enable_persistence"]:
+                self._append_op(context, {"op": "remove_task", "id": task_id})
+            
+            self.logger.debug(f"Removed task {task_id} from context {conversation_id}")
         return True
     
+    @contextmanager
+    def session(self, conversation_id: str) -> Iterator[Optional[Context]]:
+        """
+        Hold a context across a burst of related changes.
+        
+        The context is resolved once and pinned for the duration of the
+        block, so it cannot be evicted, expired or serialized while being
+        changed. On exit it is touched, reindexed and queued for one
+        snapshot write, however many changes were made. Closing the
+        outermost session also compacts the context's shared memory (see
+        compact_context), bounding conversation histories built up in it.
+        
+        Args:
+            conversation_id: Conversation identifier
+            
+        Yields:
+            Context if found, None otherwise
+        """
+        context = self._lookup_context(conversation_id)
+        if not context:
+            yield None
+            return
+        
+        self._pinned[conversation_id] = self._pinned.get(conversation_id, 0) + 1
+        try:
+            yield context
+        finally:
+            with self._lock:
+                if self._pinned[conversation_id] == 1:
+                    del self._pinned[conversation_id]
+                    self._compact_shared_memory(context)
+                else:
+                    self._pinned[conversation_id] -= 1
+                
+                self._update_indexes(context)
+                self._memory_sizes[conversation_id] = self._measure_context(context)
+                self._touch_context(context)
+            
+            if self.config["enable_persistence"]:
+                self._persist_context(context)
+    
     def merge_contexts(self, target_conversation_id: str, 
                       source_conversation_id: str) -> bool:
         """
@@ -359,7 +648,7 @@ class ContextManager:
             self.logger.warning("Context sharing is disabled")
             return False
         
-        target_context = self.get_context(target_conversation_id)
+        target_context = self._lookup_context(target_conversation_id)
         source_context = self.get_context(source_conversation_id)
         
         if not target_context or not source_context:
@@ -367,26 +656,23 @@ class ContextManager:
                               f"source: {source_context is not None}")
             return False
         
-        # Merge session data
-        target_context.session_data.update(source_context.session_data)
-        
-        # Merge shared memory
-        target_context.shared_memory.update(source_context.shared_memory)
-        
-        # Merge agent states
-        for agent_name, agent_state in source_context.agent_states.items():
-            if agent_name in target_context.agent_states:
-                target_context.agent_states[agent_name].update(agent_state)
-            else:
-                target_context.agent_states[agent_name] = agent_state.copy()
-        
-        # Merge active tasks (avoid duplicates)
-        existing_task_ids = {t.id for t in target_context.active_tasks}
-        for task in source_context.active_tasks:
-            if task.id not in existing_task_ids:
-                target_context.active_tasks.append(task)
-        
-        self._touch_context(target_context)
+        with self._lock:
+            # Merge session data and shared memory
+            target_context.session_data |= source_context.session_data
+            target_context.shared_memory |= source_context.shared_memory
+            
+            # Merge agent states (new agents get their own copy of the state)
+            target_states = target_context.agent_states
+            for agent_name, agent_state in source_context.agent_states.items():
+                target_states.setdefault(agent_name, {}).update(agent_state)
+            
+            # Merge active tasks (existing entries win on duplicate ids)
+            for task_id, task in source_context.active_tasks.items():
+                target_context.active_tasks.setdefault(task_id, task)
+            
+            self._update_indexes(target_context)
+            self._memory_sizes[target_conversation_id] = self._measure_context(target_context)
+            self._touch_context(target_context)
         
         if self.config["enable_persistence"]:
             self._persist_context(target_context)
@@ -406,16 +692,14 @@ class ContextManager:
         Returns:
             List of contexts for the user
         """
-        contexts = []
-        
-        # Search active contexts
-        for context in self._active_contexts.values():
-            if context.user_id == user_id:
-                contexts.append(context)
+        contexts = [
+            self._active_contexts[conversation_id]
+            for conversation_id in self._context_indexes["user_id"].get(user_id, ())
+        ]
         
         # Search persisted contexts if needed
         if self.config["enable_persistence"]:
-            contexts.extend(self._find_persisted_contexts_by_user(user_id))
+            contexts.extend(self._iter_persisted_contexts_by_user(user_id))
         
         return contexts
     
@@ -429,13 +713,10 @@ class ContextManager:
         Returns:
             List of contexts with agent state
         """
-        contexts = []
-        
-        for context in self._active_contexts.values():
-            if agent_name in context.agent_states:
-                contexts.append(context)
-        
-        return contexts
+        return [
+            self._active_contexts[conversation_id]
+            for conversation_id in self._context_indexes["agent_states"].get(agent_name, ())
+        ]
     
     def cleanup_expired_contexts(self) -> int:
         """
@@ -448,31 +729,182 @@ class ContextManager:
             return 0
         
         current_time = datetime.now()
-        ttl = timedelta(hours=self.config["context_ttl_hours"])
-        expired_contexts = []
+        cutoff = current_time - timedelta(hours=self.config["context_ttl_hours"])
+        expired_contexts = set()
+        
+        # Pop expired entries; contexts updated or read since their entry
+        # go back on the heap with their latest activity time. Pinned
+        # contexts are re-pushed after the loop, since their entries may
+        # still be past the cutoff.
+        heap = self._expiry_heap
+        pinned = []
+        while heap and heap[0][0] < cutoff:
+            _, conversation_id = heapq.heappop(heap)
+            context = self._active_contexts.get(conversation_id)
+            if context is None or conversation_id in expired_contexts:
+                continue
+            last_active = max(context.updated_at,
+                              self._last_accessed.get(conversation_id, context.updated_at))
+            if conversation_id in self._pinned:
+                pinned.append((last_active, conversation_id))
+            elif last_active < cutoff:
+                expired_contexts.add(conversation_id)
+            else:
+                heapq.heappush(heap, (last_active, conversation_id))
+        for entry in pinned:
+            heapq.heappush(heap, entry)
         
-        # Find expired contexts
-        for conversation_id, context in self._active_contexts.items():
-            if current_time - context.updated_at > ttl:
-                expired_contexts.append(conversation_id)
+        # Snapshot expired contexts so archives hold their latest state
+        if expired_contexts and self.config["enable_persistence"]:
+            for conversation_id in expired_contexts:
+                self._persist_context(self._active_contexts[conversation_id])
+            self.flush()
         
         # Remove expired contexts
         for conversation_id in expired_contexts:
-            context = self._active_contexts.pop(conversation_id)
-            self._remove_from_indexes(context)
+            with self._lock:
+                context = self._active_contexts.pop(conversation_id)
+                self._memory_sizes.pop(conversation_id, None)
+                self._last_accessed.pop(conversation_id, None)
+                self._remove_from_indexes(context)
             
             # Archive to persistence if enabled
             if self.config["enable_persistence"]:
-                self._archive_context(context)
+                self._archive_context(context, current_time)
         
         self.stats["contexts_expired"] += len(expired_contexts)
         self._last_cleanup = current_time
+        self._last_cleanup_monotonic = time.monotonic()
         
         if expired_contexts:
             self.logger.info(f"Cleaned up {len(expired_contexts)} expired contexts")
         
         return len(expired_contexts)
     
+    def compact_context(self, conversation_id: str) -> bool:
+        """
+        Bound a context's shared-memory growth.
+        
+        Applies the same compaction as closing a session() (see
+        _compact_shared_memory) and queues a new snapshot if anything
+        changed.
+        
+        Args:
+            conversation_id: Conversation identifier
+            
+        Returns:
+            True if any value was compacted
+        """
+        context = self._lookup_context(conversation_id)
+        if not context:
+            return False
+        
+        with self._lock:
+            changed = self._compact_shared_memory(context)
+            if changed:
+                self._memory_sizes[conversation_id] = self._measure_context(context)
+                self._touch_context(context)
+        
+        if changed and self.config["enable_persistence"]:
+            self._persist_context(context)
+        
+        return changed
+    
+    def _compact_shared_memory(self, context: Context) -> bool:
+        """
+        Bound shared-memory growth; returns True if any value was replaced.
+        
+        Lists (conversation histories) lose adjacent repeats of the same
+        tool call or tool result and are snipped to their last
+        max_history_items; tool_result dicts, on their own or inside
+        lists, get oversized text fields truncated. Values are replaced,
+        never edited in place.
+        """
+        max_items = self.config["max_history_items"]
+        max_chars = self.config["max_tool_result_chars"]
+        changed = False
+        
+        for key, value in context.shared_memory.items():
+            if isinstance(value, list):
+                compacted = [
+                    _truncate_tool_result(item, max_chars)
+                    for index, item in enumerate(value)
+                    if not (index and _is_tool_message(item) and item == value[index - 1])
+                ][-max_items:]
+                if len(compacted) != len(value) or any(
+                        new is not old for new, old in zip(compacted, value)):
+                    context.shared_memory[key] = compacted
+                    changed = True
+            else:
+                compacted = _truncate_tool_result(value, max_chars)
+                if compacted is not value:
+                    context.shared_memory[key] = compacted
+                    changed = True
+        
+        return changed
+    
+    def flush(self) -> int:
+        """
+        Write all pending context changes to storage.
+        
+        The background flusher writes contexts as their deadlines pass;
+        call this before shutdown to write everything still pending.
+        
+        Returns:
+            Number of contexts written
+        """
+        return self._flush_batch(due_only=False)
+    
+    def _flush_batch(self, due_only: bool) -> int:
+        """Write dirty contexts, or only those past their deadline if due_only."""
+        with self._flush_lock:
+            with self._lock:
+                now = time.monotonic()
+                dirty = [
+                    conversation_id
+                    for conversation_id, deadline in self._dirty_deadline.items()
+                    if not due_only or (deadline <= now and conversation_id not in self._pinned)
+                ]
+                for conversation_id in dirty:
+                    del self._dirty_deadline[conversation_id]
+                    del self._dirty_since[conversation_id]
+                
+                snapshots = []
+                for conversation_id in dirty:
+                    if conversation_id not in self._snapshot_due:
+                        continue
+                    self._snapshot_due.discard(conversation_id)
+                    context = self._active_contexts.get(conversation_id)
+                    if context:
+                        payload = self._serialize_context(context)
+                        if payload is not None:
+                            snapshots.append((conversation_id, context.user_id,
+                                              context.updated_at.timestamp(), payload))
+                op_logs = {
+                    conversation_id: self._pending_ops.pop(conversation_id)
+                    for conversation_id in dirty
+                    if conversation_id in self._pending_ops
+                }
+            
+            written = self._write_snapshots(snapshots)
+            if snapshots and not written:
+                self._retry_snapshots([snapshot[0] for snapshot in snapshots])
+            
+            oversized = []
+            for conversation_id, lines in op_logs.items():
+                if self._append_ops(conversation_id, lines):
+                    written += 1
+                    if self._op_log_oversized(conversation_id):
+                        oversized.append(conversation_id)
+            
+        # Compact outgrown logs into a fresh snapshot on the next batch
+        with self._lock:
+            for conversation_id in oversized:
+                if conversation_id in self._active_contexts:
+                    self._persist_context(self._active_contexts[conversation_id])
+        
+        return written
+    
     def get_context_stats(self) -> Dict[str, Any]:
         """
         Get context manager statistics.
@@ -497,24 +929,74 @@ class ContextManager:
             "config": self.config.copy()
         }
     
+    def _enforce_context_limit(self) -> None:
+        """Evict least recently used contexts beyond max_contexts."""
+        excess = len(self._active_contexts) - self.config["max_contexts"]
+        if excess <= 0:
+            return
+        
+        victims = list(islice(
+            (context for conversation_id, context in self._active_contexts.items()
+             if conversation_id not in self._pinned),
+            excess
+        ))
+        for context in victims:
+            self._evict_context(context)
+    
+    def _evict_context(self, context: Context) -> None:
+        """Drop a context from memory, writing its snapshot first if it has changes."""
+        conversation_id = context.conversation_id
+        with self._flush_lock:
+            with self._lock:
+                payload = None
+                if self.config["enable_persistence"] and (
+                        conversation_id in self._dirty_deadline
+                        or conversation_id not in self._snapshot_sizes):
+                    payload = self._serialize_context(context)
+                
+                # Pending changes are covered by the snapshot written below
+                self._dirty_deadline.pop(conversation_id, None)
+                self._dirty_since.pop(conversation_id, None)
+                self._snapshot_due.discard(conversation_id)
+                self._pending_ops.pop(conversation_id, None)
+                
+                del self._active_contexts[conversation_id]
+                self._memory_sizes.pop(conversation_id, None)
+                self._last_accessed.pop(conversation_id, None)
+                self._remove_from_indexes(context)
+            
+            if payload is not None and not self._write_snapshots(
+                    [(conversation_id, context.user_id, context.updated_at.timestamp(), payload)]):
+                # Keep the only copy of the changes; it is evicted again later
+                with self._lock:
+                    self._active_contexts[conversation_id] = context
+                    self._active_contexts.move_to_end(conversation_id, last=False)
+                    self._memory_sizes[conversation_id] = self._measure_context(context)
+                    self._update_indexes(context)
+                self._retry_snapshots([conversation_id])
+                return
+        
+        self.logger.debug(f"Evicted least recently used context: {conversation_id}")
+    
     def _touch_context(self, context: Context) -> None:
         """Update context timestamp."""
         context.updated_at = datetime.now()
     
+    def _access_context(self, context: Context) -> None:
+        """Record a read of context; unlike a touch this never dirties it."""
+        self._last_accessed[context.conversation_id] = datetime.now()
+    
     def _update_indexes(self, context: Context) -> None:
         """Update context indexes for fast lookup."""
         conversation_id = context.conversation_id
         
         # User ID index
-        if context.user_id not in self._context_indexes["user_id"]:
-            self._context_indexes["user_id"][context.user_id] = set()
         self._context_indexes["user_id"][context.user_id].add(conversation_id)
         
         # Agent states index
+        agent_index = self._context_indexes["agent_states"]
         for agent_name in context.agent_states:
-            if agent_name not in self._context_indexes["agent_states"]:
-                self._context_indexes["agent_states"][agent_name] = set()
-            self._context_indexes["agent_states"][agent_name].add(conversation_id)
+            agent_index[agent_name].add(conversation_id)
     
     def _remove_from_indexes(self, context: Context) -> None:
         """Remove context from indexes."""
@@ -535,117 +1017,315 @@ class ContextManager:
     
     def _should_cleanup(self) -> bool:
         """Check if cleanup should be performed."""
-        time_since_cleanup = (datetime.now() - self._last_cleanup).total_seconds()
+        time_since_cleanup = time.monotonic() - self._last_cleanup_monotonic
         return time_since_cleanup >= self.config["auto_cleanup_interval"]
     
     def _estimate_context_memory(self, context: Context) -> int:
         """Estimate memory usage of a context in bytes."""
+        size = self._memory_sizes.get(context.conversation_id)
+        return size if size is not None else self._measure_context(context)
+    
+    def _measure_context(self, context: Context) -> int:
+        """Measure a context's data from scratch; entries are sized shallowly."""
+        return sum(
+            _entry_size(key, value)
+            for data in (context.session_data, context.shared_memory, context.agent_states)
+            for key, value in data.items()
+        )
+    
+    def _persist_context(self, context: Context) -> None:
+        """Queue a full snapshot of context for the next batched write."""
+        with self._lock:
+            # The snapshot supersedes any changes still waiting for the log
+            self._pending_ops.pop(context.conversation_id, None)
+            self._snapshot_due.add(context.conversation_id)
+            self._schedule_flush(context.conversation_id)
+    
+    def _append_op(self, context: Context, op: Dict[str, Any]) -> None:
+        """Queue a single change for the context's append-only op log."""
+        op["ts"] = context.updated_at.isoformat()
         try:
-            # Convert context to JSON to estimate size
-            context_dict = {
-                "conversation_id": context.conversation_id,
-                "user_id": context.user_id,
-                "session_data": context.session_data,
-                "shared_memory": context.shared_memory,
-                "agent_states": context.agent_states,
-                # Skip active_tasks as they might be large objects
-                "created_at": context.created_at.isoformat(),
-                "updated_at": context.updated_at.isoformat()
-            }
-            return len(json.dumps(context_dict, default=str))
-        except Exception:
-            return 1024  # Default estimate
+            line = orjson.dumps(op, default=_json_default, option=_ORJSON_OPTIONS)
+        except Exception as e:
+            self.logger.error(f"Failed to serialize change for {context.conversation_id}: {e}")
+            return
+        
+        with self._lock:
+            if context.conversation_id not in self._snapshot_due:
+                self._pending_ops.setdefault(context.conversation_id, []).append(line)
+            self._schedule_flush(context.conversation_id)
     
-    def _persist_context(self, context: Context) -> bool:
-        """Persist context to storage."""
+    def _schedule_flush(self, conversation_id: str) -> None:
+        """Mark context dirty, re-arming its write deadline, and start the flusher."""
+        now = time.monotonic()
+        first_marked = self._dirty_since.setdefault(conversation_id, now)
+        self._dirty_deadline[conversation_id] = min(now + PERSIST_DEBOUNCE_INTERVAL,
+                                                    first_marked + PERSIST_FLUSH_INTERVAL)
+        self._start_flusher()
+    
+    def _retry_snapshots(self, conversation_ids: List[str]) -> None:
+        """Queue snapshots whose write failed for another attempt after a backoff."""
+        with self._lock:
+            retry_at = time.monotonic() + PERSIST_RETRY_INTERVAL
+            for conversation_id in conversation_ids:
+                if conversation_id not in self._active_contexts:
+                    continue
+                # The retried snapshot covers any changes queued since
+                self._pending_ops.pop(conversation_id, None)
+                self._snapshot_due.add(conversation_id)
+                self._dirty_since.setdefault(conversation_id, retry_at)
+                self._dirty_deadline[conversation_id] = max(
+                    self._dirty_deadline.get(conversation_id, retry_at), retry_at)
+            self._start_flusher()
+    
+    def _start_flusher(self) -> None:
+        """Start the flusher thread unless one is running; call with _lock held."""
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop,
+                                             name=f"{self.name}-flusher")
+            self._flusher.start()
+    
+    def _flush_loop(self) -> None:
+        """Write contexts as their deadlines pass; exit once nothing is dirty."""
+        try:
+            while True:
+                with self._lock:
+                    if not self._dirty_deadline:
+                        # Cleared under the same lock _schedule_flush checks,
+                        # so a context dirtied from here on starts a new flusher
+                        self._flusher = None
+                        return
+                    # Contexts held by an open session are written after it closes
+                    deadlines = [
+                        deadline for conversation_id, deadline in self._dirty_deadline.items()
+                        if conversation_id not in self._pinned
+                    ]
+                    wait = (min(deadlines) - time.monotonic()) if deadlines else PERSIST_DEBOUNCE_INTERVAL
+                
+                if wait > 0:
+                    time.sleep(wait)
+                    continue
+                
+                try:
+                    self._flush_batch(due_only=True)
+                except Exception as e:
+                    # Failed snapshot writes are requeued by _flush_batch;
+                    # anything else is logged and the loop moves on
+                    self.logger.error(f"Failed to flush contexts: {e}")
+        finally:
+            # After an unexpected exit, let the next _schedule_flush start a new flusher
+            with self._lock:
+                if self._flusher is threading.current_thread():
+                    self._flusher = None
+    
+    def _serialize_context(self, context: Context) -> Optional[bytes]:
+        """Serialize context for storage."""
         try:
-            context_file = self.storage_path / f"{context.conversation_id}.json"
-            
             # Convert context to serializable format
             context_data = {
                 "conversation_id": context.conversation_id,
                 "user_id": context.user_id,
                 "session_data": context.session_data,
-                "shared_memory": context.shared_memory,
+                "shared_memory": {
+                    key: value for key, value in context.shared_memory.items()
+                    if not isinstance(value, _CompressedValue)
+                },
+                "compressed_memory": {
+                    key: value.to_json() for key, value in context.shared_memory.items()
+                    if isinstance(value, _CompressedValue)
+                },
                 "agent_states": context.agent_states,
                 "created_at": context.created_at.isoformat(),
                 "updated_at": context.updated_at.isoformat(),
                 # Serialize tasks separately to handle complex objects
-                "task_ids": [task.id for task in context.active_tasks]
+                "task_ids": list(context.active_tasks)
             }
             
-            with open(context_file, 'w') as f:
-                json.dump(context_data, f, indent=2, default=str)
+            return orjson.dumps(context_data, default=_json_default, option=_ORJSON_OPTIONS)
+        except Exception as e:
+            self.logger.error(f"Failed to serialize context {context.conversation_id}: {e}")
+            return None
+    
+    def _write_snapshots(self, snapshots: List[tuple]) -> int:
+        """Write a batch of context snapshots and retire their op logs."""
+        if not snapshots:
+            return 0
+        
+        try:
+            conn = self._connect()
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO contexts (conversation_id, user_id, updated_at, blob) "
+                    "VALUES (?, ?, ?, ?)",
+                    snapshots
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            self.logger.error(f"Failed to persist {len(snapshots)} contexts: {e}")
+            return 0
+        
+        for conversation_id, _, _, payload in snapshots:
+            self._snapshot_sizes[conversation_id] = len(payload)
+            try:
+                self._log_path(conversation_id).unlink(missing_ok=True)
+            except OSError as e:
+                self.logger.error(f"Failed to retire op log for context {conversation_id}: {e}")
+        
+        return len(snapshots)
+    
+    def _log_path(self, conversation_id: str) -> Path:
+        """Path of a context's op log, sharded to keep directories small."""
+        return self.storage_path / "logs" / _shard(conversation_id) / f"{conversation_id}.jsonl"
+    
+    def _append_ops(self, conversation_id: str, lines: List[bytes]) -> bool:
+        """Append serialized changes to a context's op log."""
+        try:
+            log_path = self._log_path(conversation_id)
+            flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+            try:
+                fd = os.open(log_path, flags, 0o644)
+            except FileNotFoundError:
+                # First log in this shard
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(log_path, flags, 0o644)
+            
+            # One O_APPEND write per batch keeps each batch contiguous in the log
+            try:
+                _write_all(fd, b"\n".join(lines) + b"\n")
+            finally:
+                os.close(fd)
             
             return True
         except Exception as e:
-            self.logger.error(f"Failed to persist context {context.conversation_id}: {e}")
+            self.logger.error(f"Failed to append changes for context {conversation_id}: {e}")
             return False
     
+    def _op_log_oversized(self, conversation_id: str) -> bool:
+        """Check whether a context's op log has outgrown its snapshot."""
+        snapshot_size = self._snapshot_sizes.get(conversation_id)
+        if snapshot_size is None:
+            return False
+        
+        try:
+            log_size = self._log_path(conversation_id).stat().st_size
+        except OSError:
+            return False
+        
+        return log_size > LOG_COMPACTION_RATIO * snapshot_size
+    
+    def _apply_op(self, context: Context, op: Dict[str, Any]) -> None:
+        """Replay a logged change onto a loaded context."""
+        kind = op.get("op")
+        if kind == "set_mem":
+            context.shared_memory[op["k"]] = (
+                _CompressedValue.from_json(op["z"]) if "z" in op else op["v"]
+            )
+        elif kind == "update_agent":
+            context.agent_states.setdefault(op["agent"], {}).update(op["v"])
+        # Task changes only move the timestamp; tasks are not restored from storage
+        context.updated_at = datetime.fromisoformat(op["ts"])
+    
     def _load_context(self, conversation_id: str) -> Optional[Context]:
         """Load context from storage."""
         try:
-            context_file = self.storage_path / f"{conversation_id}.json"
-            if not context_file.exists():
-                return None
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT blob FROM contexts WHERE conversation_id = ?", (conversation_id,)
+                ).fetchone()
+            finally:
+                conn.close()
             
-            with open(context_file, 'r') as f:
-                context_data = json.load(f)
-            
-            # Reconstruct context
-            context = Context(
-                conversation_id=context_data["conversation_id"],
-                user_id=context_data["user_id"],
-                session_data=context_data.get("session_data", {}),
-                shared_memory=context_data.get("shared_memory", {}),
-                active_tasks=[],  # Tasks will be loaded separately if needed
-                agent_states=context_data.get("agent_states", {}),
-                created_at=datetime.fromisoformat(context_data["created_at"]),
-                updated_at=datetime.fromisoformat(context_data["updated_at"])
-            )
+            if not row:
+                return None
             
-            return context
+            self._snapshot_sizes[conversation_id] = len(row[0])
+            return self._context_from_data(orjson.loads(row[0]))
         except Exception as e:
             self.logger.error(f"Failed to load context {conversation_id}: {e}")
             return None
     
-    def _archive_context(self, context: Context) -> bool:
+    def _context_from_data(self, context_data: Dict[str, Any]) -> Context:
+        """Rebuild a context from its parsed snapshot plus its op log."""
+        context = Context(
+            conversation_id=context_data["conversation_id"],
+            user_id=context_data["user_id"],
+            session_data=context_data.get("session_data", {}),
+            shared_memory={
+                **context_data.get("shared_memory", {}),
+                **{
+                    key: _CompressedValue.from_json(value)
+                    for key, value in context_data.get("compressed_memory", {}).items()
+                }
+            },
+            active_tasks={},  # Tasks will be loaded separately if needed
+            agent_states=context_data.get("agent_states", {}),
+            created_at=datetime.fromisoformat(context_data["created_at"]),
+            updated_at=datetime.fromisoformat(context_data["updated_at"])
+        )
+        
+        # Replay changes logged since the snapshot
+        log_file = self._log_path(context.conversation_id)
+        if log_file.exists():
+            with open(log_file, 'rb') as f:
+                for line in f:
+                    try:
+                        op = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        break  # Torn tail from an interrupted append
+                    self._apply_op(context, op)
+        
+        return context
+    
+    def _archive_context(self, context: Context, archived_at: datetime) -> bool:
         """Archive expired context."""
         try:
-            archive_dir = self.storage_path / "archived"
-            archive_dir.mkdir(exist_ok=True)
+            archive_dir = self.storage_path / "archived" / _shard(context.conversation_id)
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            
+            archive_file = archive_dir / f"{context.conversation_id}_{archived_at.strftime('%Y%m%d_%H%M%S')}.json"
             
-            context_file = self.storage_path / f"{context.conversation_id}.json"
-            archive_file = archive_dir / f"{context.conversation_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT blob FROM contexts WHERE conversation_id = ?", (context.conversation_id,)
+                ).fetchone()
+                if row:
+                    # The archive must be durable before the row is deleted
+                    _write_file_atomic(archive_file, row[0])
+                    conn.execute("DELETE FROM contexts WHERE conversation_id = ?", (context.conversation_id,))
+                    conn.commit()
+            finally:
+                conn.close()
             
-            if context_file.exists():
-                context_file.rename(archive_file)
-                return True
+            self._log_path(context.conversation_id).unlink(missing_ok=True)
+            self._snapshot_sizes.pop(context.conversation_id, None)
+            return row is not None
         except Exception as e:
             self.logger.error(f"Failed to archive context {context.conversation_id}: {e}")
         
         return False
     
-    def _find_persisted_contexts_by_user(self, user_id: str) -> List[Context]:
-        """Find persisted contexts for a user."""
-        contexts = []
-        
+    def _iter_persisted_contexts_by_user(self, user_id: str) -> Iterator[Context]:
+        """Stream persisted contexts for a user, parsing each snapshot once."""
         try:
-            for context_file in self.storage_path.glob("*.json"):
-                if context_file.name.startswith("archived"):
-                    continue
-                
-                try:
-                    with open(context_file, 'r') as f:
-                        context_data = json.load(f)
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT conversation_id, blob FROM contexts WHERE user_id = ?", (user_id,)
+                )
+                for conversation_id, blob in rows:
+                    # Active contexts are already covered by the in-memory index
+                    if conversation_id in self._active_contexts:
+                        continue
                     
-                    if context_data.get("user_id") == user_id:
-                        context = self._load_context(context_data["conversation_id"])
-                        if context:
-                            contexts.append(context)
-                except Exception:
-                    continue
-        except Exception as e:
+                    try:
+                        yield self._context_from_data(orjson.loads(blob))
+                    except Exception as e:
+                        self.logger.error(f"Failed to load context {conversation_id}: {e}")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
             self.logger.error(f"Failed to search persisted contexts: {e}")
-        
-        return contexts
\ No newline at end of file
@@ -8,6 +8,7 @@ and provides the main interface for complex multi-agent operations.
 """
 
 import asyncio
+import itertools
 import logging
 import uuid
 from datetime import datetime
@@ -43,7 +44,15 @@ class Orchestrator:
         # Task management
         self._active_tasks: Dict[str, Task] = {}
         self._task_results: Dict[str, TaskResult] = {}
-        self._task_queue: List[Task] = []
+        # Ready tasks as (-priority, submit order, task id): highest priority
+        # first, FIFO among equals; _active_tasks holds the Task itself.
+        # Tasks still waiting on dependencies are parked in _pending_deps
+        # and released as each dependency completes.
+        self._task_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._task_seq = itertools.count()
+        self._pending_deps: Dict[str, Task] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._workers: List[asyncio.Task] = []
         
         # Workflow management
         self._active_workflows: Dict[str, Dict[str, Any]] = {}
@@ -53,7 +62,8 @@ class Orchestrator:
         
         # System state
         self._is_running = False
-        self._shutdown_requested = False
+        self._shutdown_event = asyncio.Event()
+        self._bg_tasks: List[asyncio.Task] = []
         
         # Configuration
         self.config = {
@@ -87,28 +97,44 @@ class Orchestrator:
         
         self.logger.info("Starting orchestrator...")
         self._is_running = True
-        self._shutdown_requested = False
+        self._shutdown_event.clear()
+        
+        # Start task workers
+        self._workers = [
+            asyncio.create_task(self._task_worker())
+            for _ in range(self.config["max_concurrent_tasks"])
+        ]
         
         # Start background tasks
-        await asyncio.gather(
-            self._heartbeat_loop(),
-            self._health_check_loop(),
-            self._task_processor_loop(),
-            return_exceptions=True
-        )
+        self._bg_tasks = [
+            asyncio.create_task(self._heartbeat_loop()),
+            asyncio.create_task(self._health_check_loop())
+        ]
     
     async def stop(self) -> None:
         """Stop the orchestrator and clean up resources."""
         self.logger.info("Stopping orchestrator...")
-        self._shutdown_requested = True
-        
-        # Stop all agents
-        for agent_name, agent_instance in self._agent_instances.items():
-            try:
-                await agent_instance.stop()
+        self._shutdown_event.set()
+        
+        # Stop background tasks and task workers
+        background = self._bg_tasks + self._workers
+        for bg_task in background:
+            bg_task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        self._bg_tasks = []
+        self._workers = []
+        
+        # Stop all agents concurrently
+        agent_names = list(self._agent_instances)
+        results = await asyncio.gather(
+            *(self._agent_instances[name].stop() for name in agent_names),
+            return_exceptions=True
+        )
+        for agent_name, result in zip(agent_names, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"Error stopping agent {agent_name}: {result}")
+            else:
                 self.logger.info(f"Stopped agent: {agent_name}")
-            except Exception as e:
-                self.logger.error(f"Error stopping agent {agent_name}: {e}")
         
         self._is_running = False
         self.logger.info("Orchestrator stopped")
@@ -197,7 +223,12 @@ class Orchestrator:
         
         # Store task
         self._active_tasks[task.id] = task
-        self._task_queue.append(task)
+        if self._are_dependencies_satisfied(task):
+            self._enqueue_task(task)
+        else:
+            self._pending_deps[task.id] = task
+            for dep_id in task.dependencies:
+                self._dependents.setdefault(dep_id, set()).add(task.id)
         
         # Store context if provided
         if context:
@@ -380,7 +411,7 @@ class Orchestrator:
             "registered_agents": len(self._registered_agents),
             "active_tasks": len(self._active_tasks),
             "active_workflows": len(self._active_workflows),
-            "task_queue_size": len(self._task_queue),
+            "task_queue_size": self._task_queue.qsize() + len(self._pending_deps),
             "task_counts": task_counts,
             "agent_counts": agent_counts,
             "agent_list": list(self._registered_agents.keys())
@@ -446,9 +477,8 @@ class Orchestrator:
         if not suitable_agents:
             return None
         
-        # Sort by current workload (prefer less loaded agents)
-        suitable_agents.sort(key=lambda x: len(x[1].current_tasks))
-        return suitable_agents[0][0]
+        # Prefer the least loaded agent
+        return min(suitable_agents, key=lambda x: len(x[1].current_tasks))[0]
     
     async def _execute_task(self, task: Task) -> None:
         """
@@ -503,6 +533,9 @@ class Orchestrator:
             # Store result
             self._task_results[task.id] = result
             
+            if task.status == TaskStatus.COMPLETED:
+                self._release_dependents(task.id)
+            
             self.logger.info(f"Task {task.id} completed with status: {task.status.value}")
             
         except Exception as e:
@@ -518,42 +551,28 @@ class Orchestrator:
                     agent_info.current_tasks.remove(task.id)
                     agent_info.error_count += 1
     
-    async def _task_processor_loop(self) -> None:
-        """Background loop for processing tasks from the queue."""
-        while self._is_running and not self._shutdown_requested:
+    async def _task_worker(self) -> None:
+        """Worker that executes tasks from the ready queue."""
+        while True:
+            _, _, task_id = await self._task_queue.get()
             try:
-                if self._task_queue:
-                    # Get tasks that are ready to execute (dependencies satisfied)
-                    ready_tasks = []
-                    for task in self._task_queue[:]:
-                        if self._are_dependencies_satisfied(task):
-                            ready_tasks.append(task)
-                            self._task_queue.remove(task)
-                    
-                    # Execute ready tasks
-                    if ready_tasks:
-                        # Limit concurrent execution
-                        current_running = sum(1 for t in self._active_tasks.values() 
-                                            if t.status == TaskStatus.RUNNING)
-                        
-                        max_concurrent = self.config["max_concurrent_tasks"]
-                        available_slots = max_concurrent - current_running
-                        
-                        tasks_to_execute = ready_tasks[:available_slots]
-                        
-                        # Execute tasks concurrently
-                        if tasks_to_execute:
-                            await asyncio.gather(
-                                *[self._execute_task(task) for task in tasks_to_execute],
-                                return_exceptions=True
-                            )
-                
-                # Wait before next iteration
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                self.logger.error(f"Error in task processor loop: {e}")
-                await asyncio.sleep(5)
+                task = self._active_tasks.get(task_id)
+                if task:
+                    await self._execute_task(task)
+            finally:
+                self._task_queue.task_done()
+    
+    def _enqueue_task(self, task: Task) -> None:
+        """Queue a task whose dependencies are satisfied."""
+        self._task_queue.put_nowait((-task.priority, next(self._task_seq), task.id))
+    
+    def _release_dependents(self, task_id: str) -> None:
+        """Queue parked tasks whose last outstanding dependency was task_id."""
+        for dependent_id in self._dependents.pop(task_id, ()):
+            task = self._pending_deps.get(dependent_id)
+            if task and self._are_dependencies_satisfied(task):
+                del self._pending_deps[dependent_id]
+                self._enqueue_task(task)
     
     def _are_dependencies_satisfied(self, task: Task) -> bool:
         """
@@ -575,9 +594,16 @@ class Orchestrator:
         
         return True
     
+    async def _wait_for_shutdown(self, timeout: float) -> None:
+        """Sleep for up to timeout seconds, waking early when stop() is called."""
+        try:
+            await asyncio.wait_for(self._shutdown_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+    
     async def _heartbeat_loop(self) -> None:
         """Background loop for agent heartbeat monitoring."""
-        while self._is_running and not self._shutdown_requested:
+        while self._is_running and not self._shutdown_event.is_set():
             try:
                 current_time = datetime.now()
                 
@@ -593,15 +619,15 @@ class Orchestrator:
                             agent_info.status = AgentStatus.UNHEALTHY
                             self.logger.warning(f"Agent {agent_name} appears unresponsive")
                 
-                await asyncio.sleep(self.config["heartbeat_interval"])
+                await self._wait_for_shutdown(self.config["heartbeat_interval"])
                 
             except Exception as e:
                 self.logger.error(f"Error in heartbeat loop: {e}")
-                await asyncio.sleep(10)
+                await self._wait_for_shutdown(10)
     
     async def _health_check_loop(self) -> None:
         """Background loop for system health monitoring."""
-        while self._is_running and not self._shutdown_requested:
+        while self._is_running and not self._shutdown_event.is_set():
             try:
                 # Monitor system health
                 total_agents = len(self._registered_agents)
@@ -614,17 +640,18 @@ class Orchestrator:
                         self.logger.warning(f"System health degraded: {healthy_agents}/{total_agents} agents healthy")
                 
                 # Monitor task queue
-                if len(self._task_queue) > 100:
-                    self.logger.warning(f"Task queue is growing large: {len(self._task_queue)} tasks")
+                queue_size = self._task_queue.qsize() + len(self._pending_deps)
+                if queue_size > 100:
+                    self.logger.warning(f"Task queue is growing large: {queue_size} tasks")
                 
                 # Clean up completed tasks
                 await self._cleanup_old_tasks()
                 
-                await asyncio.sleep(self.config["health_check_interval"])
+                await self._wait_for_shutdown(self.config["health_check_interval"])
                 
             except Exception as e:
                 self.logger.error(f"Error in health check loop: {e}")
-                await asyncio.sleep(30)
+                await self._wait_for_shutdown(30)
     
     async def _cleanup_old_tasks(self) -> None:
         """Clean up old completed tasks to prevent memory buildup."""
@@ -22,7 +22,7 @@ class AgentStatus(Enum):
     OFFLINE = "offline"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a task to be executed by an agent."""
     id: str
@@ -52,20 +52,20 @@ class TaskResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     """Conversation and execution context."""
     conversation_id: str
     user_id: str
     session_data: Dict[str, Any] = field(default_factory=dict)
     shared_memory: Dict[str, Any] = field(default_factory=dict)
-    active_tasks: List[Task] = field(default_factory=list)
+    active_tasks: Dict[str, Task] = field(default_factory=dict)
     agent_states: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentRegistration:
     """Agent registration information."""
     name: str
@@ -193,6 +193,21 @@ async def list_tools() -> List[Tool]:
                 "required": ["from_agent", "content"]
             }
         ),
+        Tool(
+            name="broadcast_message_batch",
+            description="Broadcast several messages in a single call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "messages": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "Broadcasts to send, each taking the broadcast_message arguments"
+                    }
+                },
+                "required": ["messages"]
+            }
+        ),
         Tool(
             name="get_messages",
             description="Get messages for an agent",
@@ -306,6 +321,24 @@ async def list_tools() -> List[Tool]:
                 }
             }
         ),
+        Tool(
+            name="channel_subscribers",
+            description="Count the members subscribed to a channel",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "channel": {
+                        "type": "string",
+                        "description": "Channel to count members of"
+                    },
+                    "exclude_agent": {
+                        "type": "string",
+                        "description": "Agent to leave out of the count, typically the caller (optional)"
+                    }
+                },
+                "required": ["channel"]
+            }
+        ),
         Tool(
             name="mark_message_read",
             description="Mark a message as read",
@@ -358,6 +391,8 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         return await handle_send_message(arguments)
     elif name == "broadcast_message":
         return await handle_broadcast_message(arguments)
+    elif name == "broadcast_message_batch":
+        return await handle_broadcast_message_batch(arguments)
     elif name == "get_messages":
         return await handle_get_messages(arguments)
     elif name == "create_channel":
@@ -368,6 +403,8 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         return await handle_leave_channel(arguments)
     elif name == "list_channels":
         return await handle_list_channels(arguments)
+    elif name == "channel_subscribers":
+        return await handle_channel_subscribers(arguments)
     elif name == "mark_message_read":
         return await handle_mark_message_read(arguments)
     elif name == "subscribe_to_events":
@@ -419,8 +456,16 @@ async def handle_send_message(arguments: Dict[str, Any]) -> List[TextContent]:
         conn.close()
 
 
-async def handle_broadcast_message(arguments: Dict[str, Any]) -> List[TextContent]:
-    """Broadcast a message to multiple agents or a channel."""
+def insert_broadcast(cursor: sqlite3.Cursor, arguments: Dict[str, Any]) -> tuple[List[str], List[str]]:
+    """
+    Resolve a broadcast's recipients and queue one message per recipient.
+    
+    Recipients are validated before anything is written, so a rejected
+    broadcast leaves the database untouched.
+    
+    Returns:
+        Tuple of (recipients, message_ids)
+    """
     from_agent = arguments["from_agent"]
     content = arguments["content"]
     channel = arguments.get("channel")
@@ -432,44 +477,54 @@ async def handle_broadcast_message(arguments: Dict[str, Any]) -> List[TextConten
     if len(content) > MAX_MESSAGE_SIZE:
         raise ValueError(f"Message too large (max {MAX_MESSAGE_SIZE} bytes)")
     
+    recipients = []
+    
+    if channel:
+        # Get channel members
+        cursor.execute("""
+        SELECT agent_name FROM channel_members WHERE channel_name = ?
+        """, (channel,))
+        recipients = [row[0] for row in cursor.fetchall()]
+        
+        if not recipients:
+            raise ValueError(f"Channel '{channel}' has no members")
+    else:
+        recipients = target_agents
+    
+    if not recipients:
+        raise ValueError("No recipients specified")
+    
+    # Create messages for each recipient
+    message_ids = []
+    for recipient in recipients:
+        if recipient == from_agent:  # Don't send to self
+            continue
+            
+        message_id = str(uuid.uuid4())[:8]
+        cursor.execute("""
+        INSERT INTO messages (
+            id, from_agent, to_agent, channel, message_type, subject,
+            content, priority
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            message_id, from_agent, recipient, channel, message_type,
+            subject, content, priority
+        ))
+        message_ids.append(message_id)
+    
+    return recipients, message_ids
+
+
+async def handle_broadcast_message(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Broadcast a message to multiple agents or a channel."""
+    channel = arguments.get("channel")
+    message_type = arguments.get("message_type", "info")
+    
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
     try:
-        recipients = []
-        
-        if channel:
-            # Get channel members
-            cursor.execute("""
-            SELECT agent_name FROM channel_members WHERE channel_name = ?
-            """, (channel,))
-            recipients = [row[0] for row in cursor.fetchall()]
-            
-            if not recipients:
-                raise ValueError(f"Channel '{channel}' has no members")
-        else:
-            recipients = target_agents
-        
-        if not recipients:
-            raise ValueError("No recipients specified")
-        
-        # Create messages for each recipient
-        message_ids = []
-        for recipient in recipients:
-            if recipient == from_agent:  # Don't send to self
-                continue
-                
-            message_id = str(uuid.uuid4())[:8]
-            cursor.execute("""
-            INSERT INTO messages (
-                id, from_agent, to_agent, channel, message_type, subject,
-                content, priority
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                message_id, from_agent, recipient, channel, message_type,
-                subject, content, priority
-            ))
-            message_ids.append(message_id)
+        recipients, message_ids = insert_broadcast(cursor, arguments)
         
         conn.commit()
         
@@ -485,6 +540,46 @@ async def handle_broadcast_message(arguments: Dict[str, Any]) -> List[TextConten
         conn.close()
 
 
+async def handle_broadcast_message_batch(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Broadcast several messages using one connection and transaction."""
+    broadcasts = arguments["messages"]
+    
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        results = []
+        for broadcast in broadcasts:
+            # A rejected broadcast is reported without failing the others
+            try:
+                recipients, message_ids = insert_broadcast(cursor, broadcast)
+                results.append({
+                    "subject": broadcast.get("subject", ""),
+                    "channel": broadcast.get("channel"),
+                    "messages": len(message_ids),
+                    "recipients": recipients
+                })
+            except (KeyError, ValueError) as e:
+                results.append({
+                    "subject": broadcast.get("subject", ""),
+                    "channel": broadcast.get("channel"),
+                    "error": str(e)
+                })
+        
+        conn.commit()
+        
+        return [TextContent(
+            type="text",
+            text=f"Batch broadcast sent!\n\nBroadcasts: {len(broadcasts)}\n\n" + json.dumps(results, indent=2)
+        )]
+        
+    except Exception as e:
+        conn.rollback()
+        raise ValueError(f"Failed to broadcast message batch: {e}")
+    finally:
+        conn.close()
+
+
 async def handle_get_messages(arguments: Dict[str, Any]) -> List[TextContent]:
     """Get messages for an agent."""
     agent_name = arguments["agent_name"]
@@ -796,6 +891,28 @@ async def handle_list_channels(arguments: Dict[str, Any]) -> List[TextContent]:
     return [TextContent(type="text", text=result_text)]
 
 
+async def handle_channel_subscribers(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Count channel members, optionally excluding one agent."""
+    channel = arguments["channel"]
+    exclude_agent = arguments.get("exclude_agent")
+    
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    # Served from the (channel_name, agent_name) primary key index
+    cursor.execute("""
+    SELECT COUNT(*) FROM channel_members
+    WHERE channel_name = ? AND agent_name IS NOT ?
+    """, (channel, exclude_agent))
+    count = cursor.fetchone()[0]
+    conn.close()
+    
+    return [TextContent(
+        type="text",
+        text=f"Channel '{channel}' subscribers:\n\n" + json.dumps({"channel": channel, "count": count})
+    )]
+
+
 async def handle_mark_message_read(arguments: Dict[str, Any]) -> List[TextContent]:
     """Mark a message as read."""
     message_id = arguments["message_id"]
@@ -11,12 +11,13 @@ It demonstrates core MCP server patterns:
 """
 
 import asyncio
-import json
+import errno
 import os
 import shutil
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -34,6 +35,11 @@ server = Server("file-operations-server")
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_EXTENSIONS = {'.txt', '.json', '.py', '.md', '.yml', '.yaml', '.csv'}
 BASE_DIRECTORY = Path.cwd()
+COUNT_CHUNK_SIZE = 64 * 1024  # Bytes read at a time when counting lines
+SENDFILE_CHUNK_SIZE = 8 * 1024 * 1024  # Bytes per sendfile call when copying
+
+# copy_file_range/sendfile errors meaning "not supported here", not failure
+_KERNEL_COPY_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
 
 
 def is_safe_path(path: str) -> bool:
@@ -59,7 +65,7 @@ async def list_tools() -> List[Tool]:
     return [
         Tool(
             name="read_file",
-            description="Read the contents of a file",
+            description="Read the contents of a file; a second content item holds its metadata as JSON",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -97,7 +103,7 @@ async def list_tools() -> List[Tool]:
         ),
         Tool(
             name="list_directory",
-            description="List contents of a directory",
+            description="List contents of a directory as JSON with file names, sizes and subdirectories",
             inputSchema={
                 "type": "object", 
                 "properties": {
@@ -114,6 +120,30 @@ async def list_tools() -> List[Tool]:
                 }
             }
         ),
+        Tool(
+            name="list_tree",
+            description="List a directory and its subdirectories as a nested JSON tree",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Path to the directory to list",
+                        "default": "."
+                    },
+                    "depth": {
+                        "type": "integer",
+                        "description": "Number of directory levels to include",
+                        "default": 2
+                    },
+                    "include_hidden": {
+                        "type": "boolean",
+                        "description": "Include hidden files/directories",
+                        "default": False
+                    }
+                }
+            }
+        ),
         Tool(
             name="create_directory",
             description="Create a new directory",
@@ -135,7 +165,7 @@ async def list_tools() -> List[Tool]:
         ),
         Tool(
             name="get_file_info",
-            description="Get information about a file or directory",
+            description="Get information about a file or directory as JSON",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -147,6 +177,60 @@ async def list_tools() -> List[Tool]:
                 "required": ["path"]
             }
         ),
+        Tool(
+            name="copy_file",
+            description="Copy a file within the server, without transferring its contents",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "source": {
+                        "type": "string",
+                        "description": "Path of the file to copy"
+                    },
+                    "destination": {
+                        "type": "string",
+                        "description": "Path to copy the file to"
+                    }
+                },
+                "required": ["source", "destination"]
+            }
+        ),
+        Tool(
+            name="batch_call",
+            description="Run several file operation tool calls in one request",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "requests": {
+                        "type": "array",
+                        "description": "Tool calls to run in order",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "tool": {"type": "string"},
+                                "arguments": {"type": "object"}
+                            },
+                            "required": ["tool"]
+                        }
+                    }
+                },
+                "required": ["requests"]
+            }
+        ),
+        Tool(
+            name="count_lines",
+            description="Count the lines in a text file without transferring its contents",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Path to the file to count"
+                    }
+                },
+                "required": ["path"]
+            }
+        ),
         Tool(
             name="delete_file",
             description="Delete a file or directory",
@@ -171,7 +255,13 @@ async def list_tools() -> List[Tool]:
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-    """Handle tool calls."""
+    """
+    Handle tool calls.
+    
+    Handlers run blocking file I/O in worker threads (asyncio.to_thread) so
+    that concurrent requests from an agent overlap instead of queueing
+    behind the event loop.
+    """
     
     if name == "read_file":
         return await handle_read_file(arguments)
@@ -179,12 +269,20 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         return await handle_write_file(arguments)
     elif name == "list_directory":
         return await handle_list_directory(arguments)
+    elif name == "list_tree":
+        return await handle_list_tree(arguments)
     elif name == "create_directory":
         return await handle_create_directory(arguments)
     elif name == "get_file_info":
         return await handle_get_file_info(arguments)
     elif name == "delete_file":
         return await handle_delete_file(arguments)
+    elif name == "count_lines":
+        return await handle_count_lines(arguments)
+    elif name == "copy_file":
+        return await handle_copy_file(arguments)
+    elif name == "batch_call":
+        return await handle_batch_call(arguments)
     else:
         raise ValueError(f"Unknown tool: {name}")
 
@@ -212,17 +310,31 @@ async def handle_read_file(arguments: Dict[str, Any]) -> List[TextContent]:
         raise ValueError(f"File type not allowed: {path.suffix}")
     
     try:
-        content = path.read_text(encoding='utf-8')
-        return [TextContent(
-            type="text",
-            text=f"Contents of {path_str}:\n\n{content}"
-        )]
+        content = await asyncio.to_thread(path.read_text, encoding='utf-8')
+        stat = path.stat()
+        metadata = {
+            "path": path_str,
+            "size": stat.st_size,
+            "modified": stat.st_mtime,
+            "encoding": "utf-8"
+        }
+        # Metadata rides along as a second item so callers need no get_file_info
+        return [
+            TextContent(type="text", text=f"Contents of {path_str}:\n\n{content}"),
+            TextContent(type="text", text=f"Metadata for {path_str}:\n\n{orjson.dumps(metadata).decode()}")
+        ]
     except UnicodeDecodeError:
         raise ValueError(f"Cannot read file as text: {path_str}")
     except OSError as e:
         raise ValueError(f"Error reading file: {e}")
 
 
+def write_text_file(path: Path, content: str, append: bool) -> None:
+    """Write or append text to a file."""
+    with open(path, 'a' if append else 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
 async def handle_write_file(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle write_file tool call."""
     path_str = arguments["path"]
@@ -242,11 +354,7 @@ async def handle_write_file(arguments: Dict[str, Any]) -> List[TextContent]:
     path.parent.mkdir(parents=True, exist_ok=True)
     
     try:
-        if mode == "append":
-            with open(path, 'a', encoding='utf-8') as f:
-                f.write(content)
-        else:
-            path.write_text(content, encoding='utf-8')
+        await asyncio.to_thread(write_text_file, path, content, mode == "append")
         
         return [TextContent(
             type="text",
@@ -256,6 +364,26 @@ async def handle_write_file(arguments: Dict[str, Any]) -> List[TextContent]:
         raise ValueError(f"Error writing file: {e}")
 
 
+def list_directory_entries(path: Path, include_hidden: bool) -> Dict[str, Any]:
+    """List a directory's immediate files (with sizes) and subdirectories."""
+    files = []
+    directories = []
+    for item in sorted(path.iterdir()):
+        if not include_hidden and item.name.startswith('.'):
+            continue
+        
+        if item.is_dir():
+            directories.append(item.name)
+        else:
+            try:
+                size = item.stat().st_size
+            except OSError:
+                size = None  # Size unknown
+            files.append({"name": item.name, "size": size})
+    
+    return {"files": files, "directories": directories}
+
+
 async def handle_list_directory(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle list_directory tool call."""
     path_str = arguments.get("path", ".")
@@ -273,27 +401,68 @@ async def handle_list_directory(arguments: Dict[str, Any]) -> List[TextContent]:
         raise ValueError(f"Path is not a directory: {path_str}")
     
     try:
-        items = []
-        for item in sorted(path.iterdir()):
-            if not include_hidden and item.name.startswith('.'):
+        listing = {"path": path_str, **await asyncio.to_thread(list_directory_entries, path, include_hidden)}
+        if not listing["files"] and not listing["directories"]:
+            header = f"Directory {path_str} is empty"
+        else:
+            header = f"Contents of {path_str}"
+        
+        payload = orjson.dumps(listing, option=orjson.OPT_INDENT_2).decode()
+        return [TextContent(type="text", text=f"{header}:\n\n{payload}")]
+    except OSError as e:
+        raise ValueError(f"Error listing directory: {e}")
+
+
+def scan_tree(path: str, depth: int, include_hidden: bool) -> Dict[str, Any]:
+    """Recursively list a directory; entries past the depth limit or behind symlinks are names only."""
+    files = []
+    directories = []
+    with os.scandir(path) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if not include_hidden and entry.name.startswith('.'):
                 continue
-                
-            item_type = "directory" if item.is_dir() else "file"
-            size = ""
-            if item.is_file():
+            
+            if entry.is_dir():
+                node: Dict[str, Any] = {"name": entry.name}
+                if depth > 1 and not entry.is_symlink():
+                    try:
+                        node.update(scan_tree(entry.path, depth - 1, include_hidden))
+                    except OSError as e:
+                        node["error"] = str(e)
+                directories.append(node)
+            else:
                 try:
-                    size = f" ({item.stat().st_size} bytes)"
+                    size = entry.stat().st_size
                 except OSError:
-                    size = " (size unknown)"
-            
-            items.append(f"{item_type}: {item.name}{size}")
-        
-        if not items:
-            result = f"Directory {path_str} is empty"
-        else:
-            result = f"Contents of {path_str}:\n" + "\n".join(items)
-        
-        return [TextContent(type="text", text=result)]
+                    size = None  # Size unknown
+                files.append({"name": entry.name, "size": size})
+    
+    return {"files": files, "directories": directories}
+
+
+async def handle_list_tree(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle list_tree tool call."""
+    path_str = arguments.get("path", ".")
+    depth = arguments.get("depth", 2)
+    include_hidden = arguments.get("include_hidden", False)
+    
+    if not is_safe_path(path_str):
+        raise ValueError(f"Access denied: {path_str}")
+    
+    path = Path(path_str)
+    
+    if not path.exists():
+        raise FileNotFoundError(f"Directory not found: {path_str}")
+    
+    if not path.is_dir():
+        raise ValueError(f"Path is not a directory: {path_str}")
+    
+    try:
+        tree = {"path": path_str, **await asyncio.to_thread(scan_tree, path_str, depth, include_hidden)}
+        return [TextContent(
+            type="text",
+            text=f"Tree of {path_str}:\n\n{orjson.dumps(tree, option=orjson.OPT_INDENT_2).decode()}"
+        )]
     except OSError as e:
         raise ValueError(f"Error listing directory: {e}")
 
@@ -320,6 +489,24 @@ async def handle_create_directory(arguments: Dict[str, Any]) -> List[TextContent
         raise ValueError(f"Error creating directory: {e}")
 
 
+def file_info(path: Path) -> Dict[str, Any]:
+    """Collect a path's type, size, modification time and permissions."""
+    stat = path.stat()
+    info = {
+        "path": str(path),
+        "name": path.name,
+        "type": "directory" if path.is_dir() else "file",
+        "size": stat.st_size,
+        "modified": stat.st_mtime,
+        "permissions": oct(stat.st_mode)[-3:],
+    }
+    
+    if path.is_file():
+        info["extension"] = path.suffix
+    
+    return info
+
+
 async def handle_get_file_info(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle get_file_info tool call."""
     path_str = arguments["path"]
@@ -333,26 +520,170 @@ async def handle_get_file_info(arguments: Dict[str, Any]) -> List[TextContent]:
         raise FileNotFoundError(f"Path not found: {path_str}")
     
     try:
-        stat = path.stat()
-        info = {
-            "path": str(path),
-            "name": path.name,
-            "type": "directory" if path.is_dir() else "file",
-            "size": stat.st_size,
-            "modified": stat.st_mtime,
-            "permissions": oct(stat.st_mode)[-3:],
-        }
+        info = await asyncio.to_thread(file_info, path)
+        payload = orjson.dumps(info, option=orjson.OPT_INDENT_2).decode()
+        return [TextContent(
+            type="text",
+            text=f"Information for {path_str}:\n\n{payload}"
+        )]
+    except OSError as e:
+        raise ValueError(f"Error getting file info: {e}")
+
+
+def count_file_lines(path: Path) -> int:
+    """Count lines chunk by chunk so large files are never held in memory."""
+    lines = 0
+    last = b""
+    with path.open("rb") as f:
+        while chunk := f.read(COUNT_CHUNK_SIZE):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last and last != b"\n":
+        lines += 1  # Final line without a trailing newline
+    return lines
+
+
+async def handle_count_lines(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle count_lines tool call."""
+    path_str = arguments["path"]
+    
+    if not is_safe_path(path_str):
+        raise ValueError(f"Access denied: {path_str}")
+    
+    path = Path(path_str)
+    
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {path_str}")
+    
+    if not path.is_file():
+        raise ValueError(f"Path is not a file: {path_str}")
+    
+    # Check file extension
+    if path.suffix.lower() not in ALLOWED_EXTENSIONS:
+        raise ValueError(f"File type not allowed: {path.suffix}")
+    
+    try:
+        lines = await asyncio.to_thread(count_file_lines, path)
         
-        if path.is_file():
-            info["extension"] = path.suffix
+        result = {"path": path_str, "lines": lines}
+        return [TextContent(
+            type="text",
+            text=f"Line count for {path_str}:\n\n{orjson.dumps(result).decode()}"
+        )]
+    except OSError as e:
+        raise ValueError(f"Error counting lines: {e}")
+
+
+def copy_file_contents(source: Path, destination: Path) -> int:
+    """
+    Copy a file's bytes inside the kernel where possible.
+    
+    Tries copy_file_range, then sendfile, then a user-space copy, each
+    picking up where the previous one stopped. Returns the bytes copied.
+    Raises shutil.SameFileError rather than truncating the source when
+    both paths name the same file.
+    """
+    if destination.exists() and os.path.samefile(source, destination):
+        raise shutil.SameFileError(f"{source} and {destination} are the same file")
+    
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        size = os.fstat(src_fd).st_size
+        copied = 0
+        
+        if hasattr(os, "copy_file_range"):
+            try:
+                while copied < size:
+                    n = os.copy_file_range(src_fd, dst_fd, size - copied, copied, copied)
+                    if n == 0:
+                        break
+                    copied += n
+                return copied
+            except OSError as e:
+                if e.errno not in _KERNEL_COPY_UNSUPPORTED:
+                    raise
         
-        result = f"Information for {path_str}:\n"
-        for key, value in info.items():
-            result += f"  {key}: {value}\n"
+        if hasattr(os, "sendfile"):
+            try:
+                dst.seek(copied)
+                while True:
+                    n = os.sendfile(dst_fd, src_fd, copied, SENDFILE_CHUNK_SIZE)
+                    if n == 0:
+                        break
+                    copied += n
+                return copied
+            except OSError as e:
+                if e.errno not in _KERNEL_COPY_UNSUPPORTED:
+                    raise
         
-        return [TextContent(type="text", text=result)]
+        src.seek(copied)
+        dst.seek(copied)
+        shutil.copyfileobj(src, dst)
+        return dst.tell()
+
+
+async def handle_copy_file(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle copy_file tool call."""
+    source_str = arguments["source"]
+    destination_str = arguments["destination"]
+    
+    for path_str in (source_str, destination_str):
+        if not is_safe_path(path_str):
+            raise ValueError(f"Access denied: {path_str}")
+    
+    source = Path(source_str)
+    destination = Path(destination_str)
+    
+    if not source.exists():
+        raise FileNotFoundError(f"File not found: {source_str}")
+    
+    if not source.is_file():
+        raise ValueError(f"Path is not a file: {source_str}")
+    
+    if not check_file_size(source):
+        raise ValueError(f"File too large: {source_str} (max {MAX_FILE_SIZE} bytes)")
+    
+    # Check file extensions
+    for path in (source, destination):
+        if path.suffix.lower() not in ALLOWED_EXTENSIONS:
+            raise ValueError(f"File type not allowed: {path.suffix}")
+    
+    try:
+        size = await asyncio.to_thread(copy_file_contents, source, destination)
+        
+        result = {
+            "source": source_str,
+            "destination": destination_str,
+            "size": size
+        }
+        return [TextContent(
+            type="text",
+            text=f"Successfully copied {source_str} to {destination_str}:\n\n{orjson.dumps(result).decode()}"
+        )]
     except OSError as e:
-        raise ValueError(f"Error getting file info: {e}")
+        raise ValueError(f"Error copying file: {e}")
+
+
+async def handle_batch_call(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle batch_call tool call."""
+    requests = arguments["requests"]
+    
+    results = []
+    for request in requests:
+        tool_name = request.get("tool")
+        try:
+            if tool_name == "batch_call":
+                raise ValueError("batch_call cannot be nested")
+            content = await call_tool(tool_name, request.get("arguments", {}))
+            results.append({"tool": tool_name, "status": "success", "text": content[0].text})
+        except Exception as e:
+            # One failed request must not fail the rest of the batch
+            results.append({"tool": tool_name, "status": "error", "error": str(e)})
+    
+    return [TextContent(
+        type="text",
+        text=f"Completed batch of {len(requests)} calls:\n\n{orjson.dumps(results).decode()}"
+    )]
 
 
 async def handle_delete_file(arguments: Dict[str, Any]) -> List[TextContent]:
@@ -421,7 +752,7 @@ async def read_resource(uri: str) -> str:
                 "create_directory", "get_file_info", "delete_file"
             ]
         }
-        return json.dumps(info, indent=2)
+        return orjson.dumps(info, option=orjson.OPT_INDENT_2).decode()
     else:
         raise ValueError(f"Unknown resource: {uri}")
 
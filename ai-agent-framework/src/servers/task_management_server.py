@@ -37,6 +37,14 @@ DB_PATH.parent.mkdir(exist_ok=True)
 MAX_TASKS = 1000
 TASK_RETENTION_DAYS = 30
 DEFAULT_PRIORITY = 5
+TASK_STATUSES = ("pending", "running", "completed", "failed", "cancelled")
+
+# list_tasks order_by values and the ORDER BY clauses they select
+TASK_ORDERINGS = {
+    "priority_desc": "priority DESC, created_at ASC",
+    "created_at_asc": "created_at ASC",
+    "deadline_asc": "deadline IS NULL, deadline ASC, priority DESC"
+}
 
 
 def init_database():
@@ -94,18 +102,27 @@ def init_database():
     conn.close()
 
 
-def log_task_event(task_id: str, event_type: str, event_data: Dict[str, Any] = None, agent: str = None):
-    """Log a task event to history."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def log_task_event(task_id: str, event_type: str, event_data: Dict[str, Any] = None, agent: str = None,
+                   cursor: Optional[sqlite3.Cursor] = None):
+    """
+    Log a task event to history.
+    
+    Pass the cursor of an open transaction to record the event as part of it;
+    a second connection would block on that transaction's write lock.
+    """
+    conn = None
+    if cursor is None:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
     
     cursor.execute("""
     INSERT INTO task_history (task_id, event_type, event_data, agent)
     VALUES (?, ?, ?, ?)
     """, (task_id, event_type, json.dumps(event_data or {}), agent))
     
-    conn.commit()
-    conn.close()
+    if conn is not None:
+        conn.commit()
+        conn.close()
 
 
 @server.list_tools()
@@ -150,6 +167,10 @@ async def list_tools() -> List[Tool]:
                     "assigned_agent": {
                         "type": "string",
                         "description": "Specific agent to assign task to (optional)"
+                    },
+                    "task_id": {
+                        "type": "string",
+                        "description": "Client-chosen task ID (optional, generated if omitted)"
                     }
                 },
                 "required": ["type", "description", "parameters"]
@@ -229,6 +250,17 @@ async def list_tools() -> List[Tool]:
                         "description": "Minimum priority level",
                         "minimum": 1,
                         "maximum": 10
+                    },
+                    "order_by": {
+                        "type": "string",
+                        "enum": list(TASK_ORDERINGS),
+                        "description": "Order in which tasks are returned",
+                        "default": "priority_desc"
+                    },
+                    "count_only": {
+                        "type": "boolean",
+                        "description": "Return only the number of matching tasks",
+                        "default": False
                     }
                 }
             }
@@ -302,6 +334,14 @@ async def list_tools() -> List[Tool]:
                     }
                 }
             }
+        ),
+        Tool(
+            name="get_task_counts",
+            description="Get the number of tasks in each status",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
         )
     ]
 
@@ -326,6 +366,8 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         return await handle_get_task_history(arguments)
     elif name == "get_agent_workload":
         return await handle_get_agent_workload(arguments)
+    elif name == "get_task_counts":
+        return await handle_get_task_counts(arguments)
     else:
         raise ValueError(f"Unknown tool: {name}")
 
@@ -340,8 +382,9 @@ async def handle_create_task(arguments: Dict[str, Any]) -> List[TextContent]:
     deadline = arguments.get("deadline")
     assigned_agent = arguments.get("assigned_agent")
     
-    # Generate unique task ID
-    task_id = str(uuid.uuid4())[:8]
+    # Use the client's task ID if given, so callers can reference it as a
+    # dependency before this call returns
+    task_id = arguments.get("task_id") or str(uuid.uuid4())[:8]
     
     # Parse deadline if provided
     deadline_dt = None
@@ -381,7 +424,7 @@ async def handle_create_task(arguments: Dict[str, Any]) -> List[TextContent]:
             "type": task_type,
             "priority": priority,
             "dependencies": dependencies
-        })
+        }, cursor=cursor)
         
         conn.commit()
         
@@ -508,7 +551,7 @@ async def handle_update_task_status(arguments: Dict[str, Any]) -> List[TextConte
             "to_status": status,
             "result": result,
             "error": error
-        }, agent)
+        }, agent, cursor)
         
         conn.commit()
         
@@ -531,34 +574,49 @@ async def handle_list_tasks(arguments: Dict[str, Any]) -> List[TextContent]:
     type_filter = arguments.get("task_type")
     limit = arguments.get("limit", 50)
     priority_min = arguments.get("priority_min")
+    order_by = arguments.get("order_by", "priority_desc")
+    count_only = arguments.get("count_only", False)
+    
+    if order_by not in TASK_ORDERINGS:
+        raise ValueError(f"Unknown order_by: {order_by}")
     
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
-    # Build query
-    query = """
-    SELECT id, type, description, priority, status, assigned_agent, created_at, deadline
-    FROM tasks WHERE 1=1
-    """
+    # Build filters
+    filters = ""
     params = []
     
     if status_filter:
-        query += " AND status = ?"
+        filters += " AND status = ?"
         params.append(status_filter)
     
     if agent_filter:
-        query += " AND assigned_agent = ?"
+        filters += " AND assigned_agent = ?"
         params.append(agent_filter)
     
     if type_filter:
-        query += " AND type = ?"
+        filters += " AND type = ?"
         params.append(type_filter)
     
     if priority_min:
-        query += " AND priority >= ?"
+        filters += " AND priority >= ?"
         params.append(priority_min)
     
-    query += " ORDER BY priority DESC, created_at ASC LIMIT ?"
+    if count_only:
+        cursor.execute("SELECT COUNT(*) FROM tasks WHERE 1=1" + filters, params)
+        count = cursor.fetchone()[0]
+        conn.close()
+        return [TextContent(
+            type="text",
+            text=f"Found {count} tasks:\n\n" + json.dumps({"count": count})
+        )]
+    
+    query = """
+    SELECT id, type, description, priority, status, assigned_agent, created_at, deadline,
+           dependencies
+    FROM tasks WHERE 1=1
+    """ + filters + f" ORDER BY {TASK_ORDERINGS[order_by]} LIMIT ?"
     params.append(limit)
     
     cursor.execute(query, params)
@@ -581,7 +639,8 @@ async def handle_list_tasks(arguments: Dict[str, Any]) -> List[TextContent]:
             "status": row[4],
             "assigned_agent": row[5],
             "created_at": row[6],
-            "deadline": row[7]
+            "deadline": row[7],
+            "dependencies": json.loads(row[8] or "[]")
         })
     
     return [TextContent(
@@ -795,6 +854,23 @@ async def handle_get_agent_workload(arguments: Dict[str, Any]) -> List[TextConte
     return [TextContent(type="text", text=result_text)]
 
 
+async def handle_get_task_counts(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Count tasks per status in a single query."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
+    
+    counts = dict.fromkeys(TASK_STATUSES, 0)
+    counts.update(cursor.fetchall())
+    conn.close()
+    
+    return [TextContent(
+        type="text",
+        text=f"Task counts for {sum(counts.values())} tasks:\n\n" + json.dumps(counts, indent=2)
+    )]
+
+
 @server.list_resources()
 async def list_resources() -> List[Resource]:
     """List available resources."""
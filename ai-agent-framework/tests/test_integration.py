@@ -21,9 +21,10 @@ from src.core import (
     create_framework, create_agent_registration,
     Task, TaskStatus, Context, Orchestrator, TaskRouter, ContextManager
 )
+from src.agents.base_agent import BaseAgent
 from src.agents.file_agent import FileAgent
 from src.agents.task_agent import TaskAgent
-from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.coordinator_agent import CoordinatorAgent, OrchestrationResult
 
 
 class TestFrameworkIntegration:
@@ -551,6 +552,173 @@ class TestEducationalConcepts:
             await orchestrator.stop()
 
 
+
+class RecordingAgent(BaseAgent):
+    """Minimal agent without MCP servers that records the tasks it runs."""
+    
+    def __init__(self):
+        super().__init__("recording_agent", create_agent_registration(
+            name="recording_agent",
+            capabilities=["recording"],
+            supported_task_types=["record"]
+        ))
+        self.executed = []
+    
+    async def setup(self) -> bool:
+        await self.start()
+        return True
+    
+    def _can_handle_task_specific(self, task):
+        return True
+    
+    async def _execute_task_specific(self, task, context):
+        self.executed.append(task.id)
+        return {"recorded": task.id}
+
+
+@pytest.mark.asyncio
+class TestStorageAndScheduling:
+    """
+    Regression tests for persistence, file copying and task scheduling.
+    
+    Educational Purpose:
+    These tests pin down behaviour that performance work must preserve:
+    data survives a restart, fast paths fail safely, and dependent tasks
+    still run in order.
+    """
+    
+    async def test_copy_file_rejects_same_file(self, tmp_path, monkeypatch):
+        """Copying a file onto itself fails without truncating it."""
+        from src.servers import file_operations_server as server
+        monkeypatch.setattr(server, "BASE_DIRECTORY", tmp_path)
+        
+        source = tmp_path / "a.txt"
+        source.write_text("hello")
+        
+        with pytest.raises(ValueError):
+            await server.handle_copy_file({"source": str(source), "destination": str(source)})
+        assert source.read_text() == "hello"
+        
+        destination = tmp_path / "b.txt"
+        await server.handle_copy_file({"source": str(source), "destination": str(destination)})
+        assert destination.read_text() == "hello"
+    
+    async def test_context_survives_restart(self, tmp_path):
+        """A snapshot plus later op-log changes are replayed by a new manager."""
+        manager = ContextManager(name="first_manager", storage_path=str(tmp_path))
+        manager.create_context("conv_001", "user_001", {"topic": "testing"})
+        manager.flush()
+        
+        # Changes after the snapshot go to the context's op log
+        manager.set_shared_memory("conv_001", "history", [1, 1, 2])
+        manager.set_shared_memory("conv_001", "lookalike", {"__zlib__": "user data"})
+        manager.update_agent_state("conv_001", "file_agent", {"last_action": "read_file"})
+        manager.flush()
+        assert list(tmp_path.glob("logs/*/conv_001.jsonl")), "Changes should be in the op log"
+        
+        restored = ContextManager(name="second_manager", storage_path=str(tmp_path))
+        context = restored.get_context("conv_001")
+        assert context is not None
+        assert context.user_id == "user_001"
+        assert context.session_data == {"topic": "testing"}
+        assert restored.get_shared_memory("conv_001", "history") == [1, 1, 2]
+        assert restored.get_shared_memory("conv_001", "lookalike") == {"__zlib__": "user data"}
+        assert restored.get_agent_state("conv_001", "file_agent")["last_action"] == "read_file"
+    
+    async def test_session_close_compacts_shared_memory(self, tmp_path):
+        """Closing a session bounds histories built up in shared memory."""
+        manager = ContextManager(name="compacting_manager", storage_path=str(tmp_path))
+        manager.config["max_history_items"] = 10
+        manager.create_context("conv_002", "user_002")
+        
+        tool_call = {"type": "tool_call", "name": "read_file", "arguments": {"path": "a.txt"}}
+        with manager.session("conv_002") as context:
+            context.shared_memory["history"] = [tool_call, dict(tool_call)] + list(range(50))
+            context.shared_memory["counts"] = [1, 1, 2]
+        
+        history = manager.get_shared_memory("conv_002", "history")
+        assert history == list(range(40, 50)), "History should keep only its last entries"
+        assert manager.get_shared_memory("conv_002", "counts") == [1, 1, 2], \
+            "Repeats that are not tool messages must be kept"
+        
+        with manager.session("conv_002") as context:
+            context.shared_memory["history"] = [tool_call, dict(tool_call), 1]
+        assert manager.get_shared_memory("conv_002", "history") == [tool_call, 1]
+    
+    async def test_dependent_task_released_after_dependency(self):
+        """A task waiting on a dependency runs once that dependency completes."""
+        orchestrator = Orchestrator(name="test_orchestrator")
+        agent = RecordingAgent()
+        await orchestrator.register_agent(agent)
+        await orchestrator.start()
+        
+        try:
+            await orchestrator.submit_task(Task(
+                id="second", type="record", description="Runs second",
+                parameters={}, dependencies=["first"]
+            ))
+            await asyncio.sleep(0.05)
+            assert agent.executed == [], "Dependent task must wait for its dependency"
+            
+            await orchestrator.submit_task(Task(
+                id="first", type="record", description="Runs first", parameters={}
+            ))
+            for _ in range(100):
+                if await orchestrator.get_task_status("second") == TaskStatus.COMPLETED:
+                    break
+                await asyncio.sleep(0.01)
+            
+            assert agent.executed == ["first", "second"]
+        
+        finally:
+            await orchestrator.stop()
+    
+    async def test_phase_without_type_and_raising_phase(self):
+        """Untyped phases run sequential steps and a raising phase fails in both paths."""
+        coordinator = CoordinatorAgent()
+        strategies = {}
+        
+        async def orchestrate(task):
+            name = task.parameters["name"]
+            strategies[name] = task.parameters["strategy"]
+            if name == "broken":
+                raise RuntimeError("boom")
+            return OrchestrationResult("executing", {"status": "executing"})
+        
+        async def noop(*args, **kwargs):
+            return None
+        
+        async def no_subscribers(channel):
+            return False
+        
+        coordinator._orchestrate = orchestrate
+        coordinator._queue_broadcast = noop
+        coordinator._flush_broadcasts = noop
+        coordinator._has_channel_subscribers = no_subscribers
+        
+        for phase_execution in ("concurrent", "sequential"):
+            strategies.clear()
+            result = await coordinator._handle_execute_complex_workflow(Task(
+                id=f"workflow_{phase_execution}", type="execute_complex_workflow",
+                description="Untyped phases", parameters={
+                    "workflow": {
+                        "name": "untyped",
+                        "phase_execution": phase_execution,
+                        "phases": [
+                            {"name": "plain", "steps": []},
+                            {"name": "broken", "steps": []}
+                        ]
+                    },
+                    "failure_handling": "continue"
+                }
+            ))
+            
+            assert strategies == {"plain": "sequential", "broken": "sequential"}
+            assert result["completed_phases"] == 1
+            assert result["failed_phases"] == 1
+            assert result["execution_status"] == "partial_failure"
+            assert result["phase_results"]["broken"]["error"] == "boom"
+
 # Educational test runner that explains concepts
 def run_educational_tests():
     """